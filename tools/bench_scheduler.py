@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Porsche 986/996 ACU Bench Scheduler
+Runs read -> analyze -> patch -> write -> verify jobs on several programmer
+stations at once.
+
+Usage:
+    python3 bench_scheduler.py --simulate <stations> <dump.bin|folder|archive> [...] [--action unlock]
+
+Examples:
+    # Dry run: 3 simulated stations unlocking every dump in a folder
+    python3 bench_scheduler.py --simulate 3 dumps/acu --action unlock
+
+    # Simulate flaky clips: 20% of writes corrupt a word, 3 retries allowed
+    python3 bench_scheduler.py --simulate 4 dumps/acu --fail-rate 0.2 --retries 3
+
+    # Program a remote into slot 2 on every unit (units whose slot 2 already
+    # holds a code are rejected unless --force is given)
+    python3 bench_scheduler.py --simulate 2 dumps/acu --action remote --slot 2 --code 4013A989D14C232DBF06B7C5
+
+How it works:
+    Each station has its own job queue and a lock that is held for a whole
+    job, from loading the unit through the last verify: a programmer has
+    one clip, so it works on exactly one ACU at a time. Concurrency comes
+    from the stations themselves - they all run at once, and each job's
+    analyze/patch stage runs in a thread pool, so one station's CPU work
+    overlaps the other stations' device I/O. Writes only send the 16-bit
+    words that changed (see eeprom_image.py). A failed verify re-writes just
+    the mismatched words, up to --retries times.
+
+Station interface:
+    A station is any object with a `name` attribute and three coroutines
+    that act on whichever ACU is currently clipped on:
+        await station.load(job)          -> the job's unit is on the clip
+                                            (prompt the operator, wait for
+                                            a jig, ...)
+        await station.read()             -> 512 bytes from the chip
+        await station.write_words(plan)  -> write [(word, value), ...]
+    SimulatedStation below implements it for testing without hardware.
+
+Repository: https://github.com/alexvnesta/porsche-986-immobilizer-guide
+"""
+
+import sys
+import time
+import tarfile
+import zipfile
+import random
+import asyncio
+import argparse
+
+from eeprom_io import iter_dumps
+from eeprom_image import EepromImage, word_bytes
+from eeprom_rules import check_image, ERROR
+from obd_unlock import unlock_obd, lock_obd
+from program_remote import parse_hex_code, swap_bytes, get_slot_offset, slot_has_data
+
+STAGES = ('read', 'analyze', 'patch', 'write', 'verify')
+
+
+class SimulatedStation:
+    """An in-memory programmer station with realistic (scaled) timings."""
+
+    # Seconds at time_scale=1.0: full 512-byte read, and one word write (tWC + USB overhead)
+    READ_TIME = 0.5
+    WORD_WRITE_TIME = 0.01
+
+    def __init__(self, name, time_scale=1.0, fail_rate=0.0, seed=None):
+        self.name = name
+        self.time_scale = time_scale
+        self.fail_rate = fail_rate
+        self.random = random.Random(seed)
+        # Units waiting next to the bench, and the one on the clip
+        self.tray = {}
+        self.chip = None
+
+    def insert(self, job_name, image):
+        """Put a unit on the tray; load() clips it on when its job starts."""
+        self.tray[job_name] = bytearray(image)
+
+    async def load(self, job):
+        self.chip = self.tray.pop(job['name'])
+
+    async def read(self):
+        await asyncio.sleep(self.READ_TIME * self.time_scale)
+        return bytes(self.chip)
+
+    async def write_words(self, plan):
+        await asyncio.sleep(self.WORD_WRITE_TIME * self.time_scale * len(plan))
+        for word, value in plan:
+            if self.random.random() < self.fail_rate:
+                # Bad clip contact: the word does not take
+                value ^= 1 << self.random.randrange(16)
+            self.chip[2 * word:2 * word + 2] = word_bytes(value)
+
+
+def patch_image(data, job):
+    """CPU stage: apply the job's action and return an EepromImage."""
+    if job['action'] == 'unlock':
+        return unlock_obd(data)
+    if job['action'] == 'lock':
+        return lock_obd(data)
+    if job['action'] == 'remote':
+        image = EepromImage(data)
+        code = parse_hex_code(job['code'])
+        image.write(get_slot_offset(job['slot']), code if job.get('no_swap') else swap_bytes(code))
+        return image
+    raise ValueError(f"Unknown action '{job['action']}'")
+
+
+def analyze_image(data, job):
+    """CPU stage: reasons to refuse the job - error-level findings, or a remote slot already in use."""
+    issues = [message for _, severity, message in check_image(data) if severity == ERROR]
+    if job['action'] == 'remote' and len(data) == 512 and slot_has_data(data, job['slot']):
+        issues.append(f"Slot {job['slot']} already holds a remote code")
+    return issues
+
+
+class BenchScheduler:
+    """Distributes jobs over stations and collects per-stage timings."""
+
+    def __init__(self, stations, retries=2, force=False):
+        self.stations = {station.name: station for station in stations}
+        self.retries = retries
+        self.force = force
+        self.queues = {name: asyncio.Queue() for name in self.stations}
+        self.locks = {name: asyncio.Lock() for name in self.stations}
+        self.timings = {stage: [] for stage in STAGES}
+        self.results = []
+
+    def submit(self, job):
+        """Queue a job on its station."""
+        self.queues[job['station']].put_nowait(job)
+
+    async def _timed(self, stage, awaitable):
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.timings[stage].append(time.perf_counter() - start)
+
+    async def _run_job(self, job):
+        station = self.stations[job['station']]
+        lock = self.locks[job['station']]
+        loop = asyncio.get_running_loop()
+
+        # The unit stays on the clip from the first read to the last verify
+        async with lock:
+            await station.load(job)
+            data = await self._timed('read', station.read())
+
+            issues = await self._timed('analyze', loop.run_in_executor(None, analyze_image, data, job))
+            if issues and not self.force:
+                return 'rejected', '; '.join(issues), 0
+
+            image = await self._timed('patch', loop.run_in_executor(None, patch_image, data, job))
+            expected = bytes(image)
+            plan = image.write_plan()
+            words = len(plan)
+
+            for attempt in range(self.retries + 1):
+                if plan:
+                    await self._timed('write', station.write_words(plan))
+                readback = await self._timed('verify', station.read())
+                if readback == expected:
+                    return 'ok', f"{words} words written, {attempt} retries", attempt
+                # Only re-send the words that did not take
+                retry = EepromImage(readback)
+                retry.write(0, expected)
+                plan = retry.write_plan()
+
+        return 'failed', f"verify failed after {self.retries} retries ({len(plan)} words wrong)", self.retries
+
+    async def _worker(self, name):
+        queue = self.queues[name]
+        while True:
+            job = await queue.get()
+            try:
+                status, detail, retries = await self._run_job(job)
+            except Exception as e:
+                status, detail, retries = 'failed', str(e), 0
+            self.results.append((job, status, detail, retries))
+            queue.task_done()
+
+    async def run(self):
+        """Process every queued job; returns elapsed seconds."""
+        start = time.perf_counter()
+        # One worker per station: a station never has two jobs in flight
+        workers = [asyncio.create_task(self._worker(name)) for name in self.stations]
+        await asyncio.gather(*(queue.join() for queue in self.queues.values()))
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        return time.perf_counter() - start
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def print_report(scheduler, elapsed):
+    """Print per-job results, throughput and per-stage latency."""
+    print("\n[JOBS]")
+    print("-" * 70)
+    for job, status, detail, _ in sorted(scheduler.results, key=lambda r: r[0]['name']):
+        mark = '✓' if status == 'ok' else '⚠'
+        print(f"  {mark} {job['station']:<10} {status:<9} {job['name']}")
+        print(f"      {detail}")
+
+    done = sum(1 for _, status, _, _ in scheduler.results if status == 'ok')
+    print("\n[THROUGHPUT]")
+    print("-" * 40)
+    print(f"  Completed: {done}/{len(scheduler.results)} jobs in {elapsed:.2f} s")
+    if elapsed:
+        print(f"  Jobs/hour: {done * 3600 / elapsed:.0f}")
+
+    print("\n[STAGE LATENCY] (ms)")
+    print("-" * 40)
+    print(f"  {'Stage':<8} {'count':>6} {'mean':>9} {'p95':>9} {'max':>9}")
+    for stage in STAGES:
+        values = scheduler.timings[stage]
+        if not values:
+            continue
+        mean = sum(values) / len(values)
+        print(f"  {stage:<8} {len(values):>6} {mean * 1000:>9.1f} {_percentile(values, 0.95) * 1000:>9.1f}"
+              f" {max(values) * 1000:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Porsche 986/996 ACU Bench Scheduler',
+        epilog='Example: python3 bench_scheduler.py --simulate 3 dumps/acu --action unlock'
+    )
+    parser.add_argument('dumps', nargs='+', help='Dumps, folders or archives to load into the simulated chips')
+    parser.add_argument('--simulate', type=int, required=True, metavar='N',
+                        help='Number of simulated stations (no hardware drivers are bundled)')
+    parser.add_argument('--action', choices=['unlock', 'lock', 'remote'], default='unlock')
+    parser.add_argument('--slot', type=int, choices=[1, 2, 3, 4], help='Remote slot (with --action remote)')
+    parser.add_argument('--code', help='24-character remote code (with --action remote)')
+    parser.add_argument('--retries', type=int, default=2, help='Re-writes allowed after a failed verify')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Simulated chance a word write fails')
+    parser.add_argument('--time-scale', type=float, default=1.0,
+                        help='Simulated device time multiplier (0.01 = 100x faster than a real bench)')
+    parser.add_argument('--force', '-f', action='store_true',
+                        help='Patch dumps that fail validation, and overwrite remote slots already in use')
+
+    args = parser.parse_args()
+
+    if args.action == 'remote':
+        if args.slot is None or args.code is None:
+            parser.error('--action remote requires --slot and --code')
+        try:
+            parse_hex_code(args.code)
+        except ValueError as e:
+            parser.error(f"--code: {e}")
+    if args.simulate < 1:
+        parser.error('--simulate needs at least one station')
+
+    try:
+        dumps = sorted(iter_dumps(args.dumps))
+    except FileNotFoundError as e:
+        print(f"Error: File not found - {e.filename}")
+        sys.exit(1)
+    except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+        print(f"Error: Cannot read dumps - {e}")
+        sys.exit(1)
+    dumps = [(name, data) for name, data in dumps if len(data) == 512]
+
+    stations = [SimulatedStation(f"station{i + 1}", args.time_scale, args.fail_rate, seed=i)
+                for i in range(args.simulate)]
+
+    print("=" * 70)
+    print("PORSCHE 986/996 ACU BENCH SCHEDULER (simulated)")
+    print("=" * 70)
+    print(f"Stations: {len(stations)}    Jobs: {len(dumps)}    Action: {args.action.upper()}"
+          f"    Time scale: {args.time_scale:g}")
+
+    async def run():
+        scheduler = BenchScheduler(stations, args.retries, args.force)
+        for i, (name, data) in enumerate(dumps):
+            station = stations[i % len(stations)]
+            job = {'name': name, 'station': station.name, 'action': args.action,
+                   'slot': args.slot, 'code': args.code}
+            station.insert(name, data)
+            scheduler.submit(job)
+        return scheduler, await scheduler.run()
+
+    scheduler, elapsed = asyncio.run(run())
+    print_report(scheduler, elapsed)
+
+    failed = any(status == 'failed' for _, status, _, _ in scheduler.results)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Porsche 986/996 ACU Donor Clone Planner
+Ranks candidate donor ACUs for a damaged unit (see docs/PROCEDURES.md
+section 7) and shows what writing the damaged image will overwrite on each.
+
+Usage:
+    python3 clone_planner.py <damaged.bin> <donor.bin|folder|archive> [...] [--top 3] [--patch DIR] [--output clone.bin]
+
+Examples:
+    # Rank a folder of donor dumps against a water-damaged unit
+    python3 clone_planner.py damaged_acu.bin donors/
+
+    # Donors can also come straight from a bundle
+    python3 clone_planner.py damaged_acu.bin donors.zip --top 1
+
+    # Save the write plan for each of the top 3 donors as .acup patches
+    python3 clone_planner.py damaged_acu.bin donors/ --patch plans/
+    python3 eeprom_image.py apply donor_acu.bin plans/donor1_donor_acu.acup donor_cloned.bin
+
+How donors are screened:
+    Rejected outright:
+      - Donor dump has error-level validation findings, an erased config,
+        OBD or sync region, or config blocks that don't mirror each other
+        (see eeprom_rules.py) - a bad read says nothing about the hardware
+      - Part number series 99 66 18 26 at 0x009 differs
+      - Model byte at 0x00D differs (00 = 260.xx, 20 = 262.xx)
+    Soft preferences:
+      - Same revision byte at 0x00E
+      - Most identical bytes in the config blocks 0x020-0x07F (variant and
+        frequency coding are not decoded yet, so a near-identical config is
+        the best available proxy for the same hardware variant)
+      - Fewest bytes overwritten by the damaged image
+    NOT checked (not stored at a known offset):
+      - M534 vs M535 version
+      - Remote frequency (315 MHz vs 433 MHz)
+    Confirm both on the donor's label before buying or writing it.
+
+    All donors are stacked into one buffer and every byte comparison is done
+    column-wise for the whole pool at once, so hundreds of donors score in a
+    few milliseconds.
+
+What gets written:
+    The clone is the full damaged image written to the donor (step 4 of the
+    procedure): the header holds the partial VIN and 0x088-0x09F holds
+    rolling code data, and no region is known to be safe to keep from the
+    donor. For each top donor the planner works out the exact patch - the
+    16-bit words that differ - and --patch saves it as an .acup file tied to
+    that donor's dump (see eeprom_image.py), so only those words need
+    reflashing. --output saves the full image instead.
+
+Repository: https://github.com/alexvnesta/porsche-986-immobilizer-guide
+"""
+
+import os
+import sys
+import time
+import tarfile
+import zipfile
+import argparse
+
+from eeprom_io import iter_dumps, read_dump
+from eeprom_rules import check_image, run_batch, ERROR
+from eeprom_image import EepromImage, WORD_COUNT, encode_patch
+
+EEPROM_SIZE = 512
+
+# (name, offset, length) per docs/EEPROM_MAP.md, used to report what a clone overwrites
+MAP_REGIONS = [
+    ('Header / partial VIN', 0x000, 0x09),
+    ('Part number', 0x009, 0x06),
+    ('Vehicle configuration', 0x00F, 0x11),
+    ('Config block A', 0x020, 0x30),
+    ('Config block B', 0x050, 0x30),
+    ('OBD flags', 0x080, 0x08),
+    ('Flags / rolling code', 0x088, 0x18),
+    ('Auth / unlock data', 0x0A0, 0x1A),
+    ('Transponder IDs', 0x0BA, 0x28),
+    ('Radio codes', 0x0E2, 0x1E),
+    ('Remote slots', 0x100, 0x60),
+    ('Unused', 0x160, 0x50),
+    ('Counter / sync', 0x1B0, 0x10),
+    ('Unused', 0x1C0, 0x2E),
+    ('PIN + ECU pairing', 0x1EE, 0x12),
+]
+
+CONFIG_OFFSET = 0x020
+CONFIG_LENGTH = 0x60
+
+# Warning-level findings that still make a dump useless as a donor
+DONOR_REJECT_RULES = ('erased-region', 'config-mirror')
+
+
+def _match_counts(stack, count, source, offset, length):
+    """Per-donor count of bytes in the field that equal the source (length < 256)."""
+    total = 0
+    # Each donor owns one byte lane of the integer, so the additions never carry
+    for i in range(offset, offset + length):
+        table = bytearray(256)
+        table[source[i]] = 1
+        total += int.from_bytes(stack[i::EEPROM_SIZE].translate(bytes(table)), 'big')
+    return total.to_bytes(count, 'big')
+
+
+def screen_donors(donors):
+    """
+    Validate every donor in one batch.
+    Returns one list of rejection reasons per donor (empty = usable).
+    """
+    reasons = []
+    for findings in run_batch(donors):
+        reasons.append([message for name, severity, message in findings
+                        if severity == ERROR or name in DONOR_REJECT_RULES])
+    return reasons
+
+
+def score_donors(source, donors):
+    """
+    Score every donor against the damaged source image in one pass.
+    Returns a list of (index, compatible, score, details) sorted best first.
+    Donors that are not 512 bytes are skipped.
+    """
+    indices = [i for i, data in enumerate(donors) if len(data) == EEPROM_SIZE]
+    if not indices:
+        return []
+
+    stack = b''.join(donors[i] for i in indices)
+    count = len(indices)
+
+    series = _match_counts(stack, count, source, 0x009, 4)
+    model = _match_counts(stack, count, source, 0x00D, 1)
+    revision = _match_counts(stack, count, source, 0x00E, 1)
+    config = _match_counts(stack, count, source, CONFIG_OFFSET, CONFIG_LENGTH)
+    # Regions are counted separately: a whole-image total would overflow a byte lane
+    same = [_match_counts(stack, count, source, offset, length) for _, offset, length in MAP_REGIONS]
+
+    results = []
+    for lane, index in enumerate(indices):
+        compatible = series[lane] == 4 and model[lane] == 1
+        overwritten = EEPROM_SIZE - sum(region[lane] for region in same)
+        score = (1000 if compatible else 0) + 100 * revision[lane] + config[lane]
+        details = {
+            'revision_match': bool(revision[lane]),
+            'config_match': config[lane],
+            'overwritten': overwritten,
+        }
+        results.append((index, compatible, score, details))
+
+    results.sort(key=lambda r: (-r[2], r[3]['overwritten']))
+    return results
+
+
+def region_changes(source, donor):
+    """(region name, offset, length, differing bytes) for every region the clone changes."""
+    changes = []
+    for name, offset, length in MAP_REGIONS:
+        differ = sum(1 for i in range(offset, offset + length) if source[i] != donor[i])
+        if differ:
+            changes.append((name, offset, length, differ))
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Porsche 986/996 ACU Donor Clone Planner',
+        epilog='Example: python3 clone_planner.py damaged_acu.bin donors/ --top 3'
+    )
+    parser.add_argument('source', help='EEPROM dump from the damaged ACU')
+    parser.add_argument('donors', nargs='+', help='Donor dumps, folders or zip/tar archives')
+    parser.add_argument('--top', type=int, default=3, help='Number of donors to work out the patch for')
+    parser.add_argument('--patch', '-p', metavar='DIR',
+                        help='Save each top donor\'s write plan as DIR/donor<rank>_<name>.acup')
+    parser.add_argument('--output', '-o', help='Save the full clone image (to write to any ranked donor)')
+
+    args = parser.parse_args()
+
+    try:
+        source = read_dump(args.source)
+        pool = sorted(iter_dumps(args.donors))
+    except FileNotFoundError as e:
+        print(f"Error: File not found - {e.filename}")
+        sys.exit(1)
+    except (OSError, ValueError, zipfile.BadZipFile, tarfile.TarError) as e:
+        print(f"Error: Cannot read dumps - {e}")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("PORSCHE 986/996 ACU DONOR CLONE PLANNER")
+    print("=" * 70)
+    print(f"Source: {args.source} ({len(source)} bytes)")
+    print(f"Donors: {len(pool)}")
+
+    if len(source) != EEPROM_SIZE:
+        print(f"\nError: Source must be {EEPROM_SIZE} bytes, got {len(source)}")
+        sys.exit(1)
+
+    errors = [message for _, severity, message in check_image(source) if severity == ERROR]
+    for message in errors:
+        print(f"  ⚠ Source: {message}")
+
+    # A byte-identical dump is the damaged unit itself, not a donor
+    pool = [(name, data) for name, data in pool if data != source]
+
+    start = time.perf_counter()
+    rejected = []
+    usable = []
+    for (name, data), reasons in zip(pool, screen_donors([data for _, data in pool])):
+        if reasons:
+            rejected.append((name, reasons))
+        else:
+            usable.append((name, data))
+    names = [name for name, _ in usable]
+    donors = [data for _, data in usable]
+    ranked = score_donors(source, donors)
+    elapsed = time.perf_counter() - start
+    print(f"Scored {len(ranked)} donors in {elapsed * 1000:.1f} ms")
+    print("=" * 70)
+
+    if rejected:
+        print("\n[REJECTED DONORS]")
+        print("-" * 70)
+        for name, reasons in rejected:
+            print(f"  ⚠ {name}")
+            for reason in reasons:
+                print(f"      {reason}")
+
+    compatible = [r for r in ranked if r[1]]
+    if not compatible:
+        print("\nNo compatible donor found (part number series and model must match)")
+        sys.exit(1)
+
+    print("\n[DONOR RANKING]")
+    print("-" * 70)
+    print("  Rank  Score  Rev  Config  Overwritten  Donor")
+    for rank, (index, _, score, details) in enumerate(compatible, 1):
+        rev = 'yes' if details['revision_match'] else 'no'
+        print(f"  {rank:>4}  {score:>5}  {rev:<3}  {details['config_match']:>3}/{CONFIG_LENGTH}"
+              f"  {details['overwritten']:>11}  {names[index]}")
+    print("\n  ⚠ M534/M535 version and remote frequency are NOT checked - confirm them on the donor label")
+
+    for rank, (index, _, _, _) in enumerate(compatible[:args.top], 1):
+        image = EepromImage(donors[index])
+        image.write(0, source)
+        print(f"\n[WRITING THE DAMAGED IMAGE TO DONOR #{rank}] {names[index]}")
+        print("-" * 70)
+        print(f"  {len(image.write_plan())} of {WORD_COUNT} words change")
+        for name, offset, length, differ in region_changes(source, donors[index]):
+            print(f"  0x{offset:03X}-0x{offset + length - 1:03X}  {differ:>3}/{length:<3} bytes  {name}")
+        if args.patch:
+            os.makedirs(args.patch, exist_ok=True)
+            stem = os.path.splitext(os.path.basename(names[index].split(':')[-1]))[0]
+            path = os.path.join(args.patch, f"donor{rank}_{stem}.acup")
+            with open(path, 'wb') as f:
+                f.write(encode_patch(image))
+            print(f"  ✓ Patch saved to: {path}")
+
+    if args.output:
+        with open(args.output, 'wb') as f:
+            f.write(source)
+        print(f"\n✓ Clone image saved to: {args.output}")
+
+    print(f"\nNext: back up the donor, then write {args.output or args.source} to it in full,")
+    print("      or apply its .acup patch (PROCEDURES.md section 7, step 4)")
+
+
+if __name__ == "__main__":
+    main()
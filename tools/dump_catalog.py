@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Porsche 986/996 ACU Dump Catalog
+Decodes every dump once into an indexed SQLite database so lookups across the
+whole archive don't need to re-run the analyzer.
+
+Usage:
+    python3 dump_catalog.py build <catalog.db> <dump.bin|folder|archive> [...]
+    python3 dump_catalog.py query <catalog.db> [--pin ..] [--pairing ..] [--part ..] [--obd ..]
+
+Examples:
+    # Build (or update) the catalog - unchanged dumps are skipped by content hash
+    python3 dump_catalog.py build catalog.db dumps/ customer_bundles/
+
+    # All dumps with PIN DC 6F C2
+    python3 dump_catalog.py query catalog.db --pin "DC 6F C2"
+
+    # All 262.03 units that are OBD-unlocked
+    python3 dump_catalog.py query catalog.db --part 262.03 --obd unlocked
+
+    # Every module sharing a pairing code (given as hex or taken from a dump)
+    python3 dump_catalog.py query catalog.db --pairing "3D B8 7A 21 E9 94"
+    python3 dump_catalog.py query catalog.db --same-pairing-as dumps/acu/2002_996_m534.bin
+
+Tables:
+    dumps         one row per distinct content (sha256): part number, OBD
+                  status, PIN and pairing with mirror flags, sync presence
+    sources       file or archive member name -> content hash
+    slots         remote slot status and code per dump
+    transponders  transponder ID per key per dump
+
+Repository: https://github.com/alexvnesta/porsche-986-immobilizer-guide
+"""
+
+import sys
+import time
+import sqlite3
+import hashlib
+import tarfile
+import zipfile
+import argparse
+
+from eeprom_io import iter_dumps, read_dump
+from eeprom_analyzer import (analyze_part_number, analyze_pin, analyze_ecu_pairing,
+                             analyze_remote_slot, analyze_sync_region)
+from obd_unlock import check_obd_status
+
+BATCH_SIZE = 1000
+
+# Key N transponder ID: 4 bytes at these offsets (see docs/EEPROM_MAP.md)
+TRANSPONDER_OFFSETS = {1: 0x0BA, 2: 0x0BF, 3: 0x0C4, 4: 0x0C9}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dumps (
+    hash          TEXT PRIMARY KEY,
+    size          INTEGER NOT NULL,
+    part          TEXT,
+    obd           TEXT,
+    pin           TEXT,
+    pin_match     INTEGER,
+    pairing       TEXT,
+    pairing_match INTEGER,
+    sync          INTEGER
+);
+CREATE TABLE IF NOT EXISTS sources (
+    name TEXT PRIMARY KEY,
+    hash TEXT NOT NULL REFERENCES dumps(hash)
+);
+CREATE TABLE IF NOT EXISTS slots (
+    hash   TEXT NOT NULL REFERENCES dumps(hash),
+    slot   INTEGER NOT NULL,
+    status TEXT,
+    code   TEXT,
+    PRIMARY KEY (hash, slot)
+);
+CREATE TABLE IF NOT EXISTS transponders (
+    hash TEXT NOT NULL REFERENCES dumps(hash),
+    key  INTEGER NOT NULL,
+    id   TEXT,
+    PRIMARY KEY (hash, key)
+);
+CREATE INDEX IF NOT EXISTS dumps_pin ON dumps(pin);
+CREATE INDEX IF NOT EXISTS dumps_pairing ON dumps(pairing);
+CREATE INDEX IF NOT EXISTS dumps_part_obd ON dumps(part, obd);
+CREATE INDEX IF NOT EXISTS dumps_obd ON dumps(obd);
+CREATE INDEX IF NOT EXISTS sources_hash ON sources(hash);
+CREATE INDEX IF NOT EXISTS slots_code ON slots(code);
+CREATE INDEX IF NOT EXISTS transponders_id ON transponders(id);
+"""
+
+
+def hex_key(data):
+    """Canonical hex form used for stored and queried codes: 'DC6FC2'."""
+    return data.hex().upper() if data is not None else None
+
+
+def normalize_hex(text):
+    """Accept 'DC 6F C2', 'dc-6f-c2' or 'DC6FC2' from the command line."""
+    clean = text.replace(' ', '').replace('-', '').replace(':', '').upper()
+    try:
+        bytes.fromhex(clean)
+    except ValueError:
+        raise ValueError(f"Invalid hex code '{text}'")
+    return clean
+
+
+def decode_dump(data):
+    """
+    Decode the catalogued fields of one dump.
+    Returns (dump row without hash, slot rows, transponder rows).
+    """
+    if len(data) != 512:
+        return (len(data), None, None, None, None, None, None, None), [], []
+
+    part = analyze_part_number(data)
+    part = part.split('-> ')[1] if '-> ' in part else None
+    obd, _ = check_obd_status(data)
+    pin1, _, pin_match = analyze_pin(data)
+    pairing1, _, pairing_match = analyze_ecu_pairing(data)
+    sync = bytes([0xB2, 0x22, 0xD4]) in analyze_sync_region(data)
+
+    slots = []
+    for slot in range(1, 5):
+        slot_data, status = analyze_remote_slot(data, slot)
+        programmed = status == 'PROGRAMMED'
+        slots.append((slot, 'programmed' if programmed else 'empty',
+                      hex_key(slot_data) if programmed else None))
+
+    transponders = []
+    for key, offset in TRANSPONDER_OFFSETS.items():
+        tag = data[offset:offset + 4]
+        if tag not in (b'\xFF' * 4, b'\x00' * 4):
+            transponders.append((key, hex_key(tag)))
+
+    row = (len(data), part, obd, hex_key(pin1), int(pin_match),
+           hex_key(pairing1), int(pairing_match), int(sync))
+    return row, slots, transponders
+
+
+def open_catalog(path):
+    """Open (creating if needed) a catalog database."""
+    db = sqlite3.connect(path)
+    # WAL keeps readers unblocked while a bulk build is committing batches
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(SCHEMA)
+    return db
+
+
+def build_catalog(db, paths, workers=4):
+    """
+    Add every dump under `paths` to the catalog.
+    Content already present (same sha256) is not decoded again; only the
+    source name mapping is updated. Returns (seen, decoded).
+    """
+    known = {row[0] for row in db.execute("SELECT hash FROM dumps")}
+    dumps, sources, slots, transponders = [], [], [], []
+    seen = decoded = 0
+
+    def flush():
+        with db:
+            db.executemany("INSERT OR IGNORE INTO dumps VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", dumps)
+            db.executemany("INSERT OR IGNORE INTO slots VALUES (?, ?, ?, ?)", slots)
+            db.executemany("INSERT OR IGNORE INTO transponders VALUES (?, ?, ?)", transponders)
+            db.executemany("INSERT OR REPLACE INTO sources VALUES (?, ?)", sources)
+        for rows in (dumps, sources, slots, transponders):
+            rows.clear()
+
+    for name, data in iter_dumps(paths, workers=workers):
+        seen += 1
+        digest = hashlib.sha256(data).hexdigest()
+        sources.append((name, digest))
+        if digest not in known:
+            known.add(digest)
+            decoded += 1
+            row, slot_rows, transponder_rows = decode_dump(data)
+            dumps.append((digest,) + row)
+            slots.extend((digest,) + slot_row for slot_row in slot_rows)
+            transponders.extend((digest,) + tag_row for tag_row in transponder_rows)
+        if len(sources) >= BATCH_SIZE:
+            flush()
+
+    flush()
+    return seen, decoded
+
+
+def query_catalog(db, pin=None, pairing=None, part=None, obd=None, transponder=None, remote=None):
+    """Return (source name, part, obd, pin, pairing) rows matching every given filter."""
+    clauses, params = [], []
+    if pin:
+        clauses.append("d.pin = ?")
+        params.append(normalize_hex(pin))
+    if pairing:
+        clauses.append("d.pairing = ?")
+        params.append(normalize_hex(pairing))
+    if part:
+        clauses.append("d.part = ?")
+        params.append(part if part.startswith('996.') else f"996.618.{part}")
+    if obd:
+        clauses.append("d.obd = ?")
+        params.append(obd)
+    if transponder:
+        clauses.append("d.hash IN (SELECT hash FROM transponders WHERE id = ?)")
+        params.append(normalize_hex(transponder))
+    if remote:
+        clauses.append("d.hash IN (SELECT hash FROM slots WHERE code = ?)")
+        params.append(normalize_hex(remote))
+
+    sql = ("SELECT s.name, d.part, d.obd, d.pin, d.pin_match, d.pairing, d.pairing_match "
+           "FROM dumps d JOIN sources s ON s.hash = d.hash")
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY s.name"
+    return db.execute(sql, params).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Porsche 986/996 ACU Dump Catalog',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python3 dump_catalog.py build catalog.db dumps/
+    python3 dump_catalog.py query catalog.db --pin "DC 6F C2"
+    python3 dump_catalog.py query catalog.db --part 262.03 --obd unlocked
+        """
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = commands.add_parser('build', help='Add dumps to the catalog (incremental)')
+    build_parser.add_argument('catalog', help='SQLite catalog file')
+    build_parser.add_argument('paths', nargs='+', help='Dumps, folders or zip/tar archives')
+    build_parser.add_argument('--workers', '-j', type=int, default=4, help='Parallel readers for files and archives')
+
+    query_parser = commands.add_parser('query', help='Look up dumps by decoded fields')
+    query_parser.add_argument('catalog', help='SQLite catalog file')
+    query_parser.add_argument('--pin', help='PIN / key learning code, e.g. "DC 6F C2"')
+    query_parser.add_argument('--pairing', help='ECU pairing code (6 bytes)')
+    query_parser.add_argument('--same-pairing-as', metavar='DUMP', help='Use the pairing code of this dump')
+    query_parser.add_argument('--part', help='Part number, e.g. 262.03 or 996.618.262.03')
+    query_parser.add_argument('--obd', choices=['locked', 'unlocked', 'unknown'], help='OBD programming status')
+    query_parser.add_argument('--transponder', help='Transponder ID (4 bytes)')
+    query_parser.add_argument('--remote', help='Remote code as stored in EEPROM (12 bytes)')
+
+    args = parser.parse_args()
+
+    try:
+        db = open_catalog(args.catalog)
+        if args.command == 'build':
+            start = time.perf_counter()
+            seen, decoded = build_catalog(db, args.paths, args.workers)
+            elapsed = time.perf_counter() - start
+            total = db.execute("SELECT COUNT(*) FROM dumps").fetchone()[0]
+            print(f"Scanned {seen} dumps, decoded {decoded} new in {elapsed:.2f} s")
+            print(f"Catalog {args.catalog}: {total} distinct dumps")
+            return
+
+        pairing = args.pairing
+        if args.same_pairing_as:
+            pairing = hex_key(analyze_ecu_pairing(read_dump(args.same_pairing_as))[0])
+            if pairing is None:
+                print(f"Error: {args.same_pairing_as} is too short to hold a pairing code")
+                sys.exit(1)
+        start = time.perf_counter()
+        rows = query_catalog(db, args.pin, pairing, args.part, args.obd, args.transponder, args.remote)
+        elapsed = time.perf_counter() - start
+    except FileNotFoundError as e:
+        print(f"Error: File not found - {e.filename}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except (sqlite3.Error, zipfile.BadZipFile, tarfile.TarError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"{'Part':<15} {'OBD':<9} {'PIN':<8} {'Pairing':<13} Dump")
+    print("-" * 70)
+    for name, part, obd, pin, pin_match, pairing, pairing_match in rows:
+        pin_text = (pin or '-') + ('*' if pin_match == 0 else '')
+        pairing_text = (pairing or '-') + ('*' if pairing_match == 0 else '')
+        print(f"{part or '-':<15} {obd or '-':<9} {pin_text:<8} {pairing_text:<13} {name}")
+    print(f"\n{len(rows)} matches in {elapsed * 1000:.1f} ms  (* = mirror copy differs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,20 @@ Extracts and displays all known codes and data from a 93LC66 EEPROM dump.
 
 Usage:
     python3 eeprom_analyzer.py <eeprom.bin> [--compare <other.bin>]
+    python3 eeprom_analyzer.py <bundle.zip|bundle.tar.gz|folder>
+    python3 eeprom_analyzer.py bundle.zip:acu/dump.bin --compare bundle.zip:acu/donor.bin
 
 Repository: https://github.com/YOUR_USERNAME/porsche-986-immobilizer-guide
 """
 
+import os
 import sys
 import argparse
 
+from eeprom_io import iter_dumps, read_dump, is_archive
+from eeprom_scan import realign, describe_alignment
+from eeprom_rules import check_image, SEVERITY_ORDER
+
 def format_hex(data, start_offset=0, bytes_per_line=16):
     """Format bytes as a hex dump with ASCII representation."""
     lines = []
@@ -141,10 +148,10 @@ def analyze_sync_region(data):
     return data[0x1B0:0x1C0]
 
 
-def print_analysis(filepath):
+def print_analysis(filepath, data=None, fix_alignment=False):
     """Main analysis function."""
-    with open(filepath, 'rb') as f:
-        data = f.read()
+    if data is None:
+        data = read_dump(filepath)
     
     print("=" * 70)
     print("PORSCHE 986/996 ACU EEPROM ANALYSIS")
@@ -154,6 +161,22 @@ def print_analysis(filepath):
     
     if len(data) != 512:
         print(f"⚠ WARNING: Expected 512 bytes for 93LC66, got {len(data)}")
+
+    # Shifted, wrapped or byte-swapped reads make every fixed offset below wrong
+    try:
+        realigned, alignment = realign(data)
+    except ValueError:
+        alignment = None
+    if alignment and alignment['conflict']:
+        print(f"⚠ WARNING: Read is inconsistent ({describe_alignment(alignment)})")
+        print("  Parts of the image match different byte orders - decoding it as read, not realigning")
+    elif alignment and (alignment['delta'] or alignment['swapped'] or len(data) != 512):
+        if fix_alignment:
+            print(f"✓ Realigned: {describe_alignment(alignment)}")
+            data = realigned
+        else:
+            print(f"⚠ WARNING: Read looks misaligned ({describe_alignment(alignment)})")
+            print("  Re-run with --realign to decode the corrected image")
     
     print("=" * 70)
     
@@ -243,6 +266,16 @@ def print_analysis(filepath):
     if len(data) >= 0x200:
         print(format_hex(data[0x1E0:0x200], 0x1E0))
     
+    # Validation rules
+    print("\n[VALIDATION]")
+    print("-" * 40)
+    findings = sorted(check_image(data), key=lambda f: SEVERITY_ORDER[f[1]])
+    if findings:
+        for name, severity, message in findings:
+            print(f"  [{severity.upper():<7}] {name}: {message}")
+    else:
+        print("  ✓ All validation rules passed")
+
     # Full dump option
     print("\n" + "=" * 70)
     print("FULL HEX DUMP")
@@ -254,10 +287,8 @@ def print_analysis(filepath):
 
 def compare_dumps(file1, file2):
     """Compare two EEPROM dumps and highlight differences."""
-    with open(file1, 'rb') as f:
-        data1 = f.read()
-    with open(file2, 'rb') as f:
-        data2 = f.read()
+    data1 = read_dump(file1)
+    data2 = read_dump(file2)
     
     print("\n" + "=" * 70)
     print("EEPROM COMPARISON")
@@ -320,13 +351,26 @@ def main():
         description='Porsche 986/996 ACU EEPROM Analyzer',
         epilog='Example: python3 eeprom_analyzer.py my_dump.bin --compare donor.bin'
     )
-    parser.add_argument('eeprom', help='EEPROM dump file (512 bytes)')
-    parser.add_argument('--compare', '-c', help='Compare with another EEPROM dump')
+    parser.add_argument('eeprom', help='EEPROM dump file (512 bytes), folder, zip/tar archive or archive.zip:member')
+    parser.add_argument('--compare', '-c', help='Compare with another EEPROM dump (file or archive.zip:member)')
+    parser.add_argument('--realign', action='store_true',
+                        help='Decode shifted, wrapped or byte-swapped reads after realigning them')
     
     args = parser.parse_args()
+
+    bundle = is_archive(args.eeprom) or os.path.isdir(args.eeprom)
+    if args.compare and (bundle or is_archive(args.compare) or os.path.isdir(args.compare)):
+        parser.error('--compare needs two single dumps (a file or archive.zip:member), not a folder or archive')
     
     try:
-        print_analysis(args.eeprom)
+        if bundle:
+            # Analyze every dump in the bundle/folder as it is read (members are
+            # read in parallel, so the order is not fixed)
+            for name, data in iter_dumps([args.eeprom]):
+                print_analysis(name, data, args.realign)
+                print()
+        else:
+            print_analysis(args.eeprom, fix_alignment=args.realign)
         
         if args.compare:
             compare_dumps(args.eeprom, args.compare)
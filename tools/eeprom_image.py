@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Porsche 986/996 ACU EEPROM Image with Minimal Write Plan
+Tracks which bytes an edit actually changed so only those 16-bit words of the
+93LC66 need to be rewritten, instead of reflashing all 512 bytes.
+
+Usage:
+    python3 eeprom_image.py plan <original.bin> <modified.bin> [--patch out.acup]
+    python3 eeprom_image.py apply <original.bin> <patch.acup> <output.bin>
+
+Examples:
+    # Which words does an OBD unlock really touch?
+    python3 eeprom_image.py plan locked.bin unlocked.bin
+
+    # Save a compact patch and apply it to another copy of the same dump
+    python3 eeprom_image.py plan locked.bin unlocked.bin --patch unlock.acup
+    python3 eeprom_image.py apply locked.bin unlock.acup unlocked.bin
+
+Word addressing:
+    The 93LC66 has 256 words of 16 bits (ORG pin high). Word N holds bytes
+    2N and 2N+1 of the 8-bit dump, so the word address of a byte offset is
+    offset >> 1. The pair is stored reversed in the dump (see "Byte-Swapping"
+    in docs/EEPROM_MAP.md): byte 2N is the word's low byte and 2N+1 its high
+    byte. word_value() and word_bytes() are the one place that mapping lives;
+    every word value in a plan or patch is the value shifted to the chip.
+
+Patch file format (.acup):
+    8-byte magic "93LC66P2", the 32-byte SHA-256 of the dump the patch was
+    made against, then one 3-byte record per changed word: word address
+    (1 byte), word value (2 bytes, big-endian). A patch is only applied to
+    the exact dump it was made from.
+
+Repository: https://github.com/alexvnesta/porsche-986-immobilizer-guide
+"""
+
+import sys
+import hashlib
+import argparse
+
+from eeprom_io import read_dump
+from eeprom_rules import check_image, rules_touching
+
+EEPROM_SIZE = 512
+WORD_COUNT = EEPROM_SIZE // 2
+PATCH_MAGIC = b'93LC66P2'
+PATCH_HEADER = len(PATCH_MAGIC) + 32
+# Byte order of a 16-bit chip word inside an 8-bit dump
+WORD_BYTE_ORDER = 'little'
+
+
+def word_value(data, word):
+    """16-bit chip value of word N of a dump."""
+    return int.from_bytes(data[2 * word:2 * word + 2], WORD_BYTE_ORDER)
+
+
+def word_bytes(value):
+    """The two dump bytes (offsets 2N, 2N+1) that hold a 16-bit chip value."""
+    return value.to_bytes(2, WORD_BYTE_ORDER)
+
+
+class EepromImage:
+    """A mutable 512-byte EEPROM image that remembers which bytes were changed."""
+
+    def __init__(self, data):
+        if len(data) != EEPROM_SIZE:
+            raise ValueError(f"Size is {len(data)} bytes, expected {EEPROM_SIZE}")
+        self.original = bytes(data)
+        self.data = bytearray(data)
+        # Sorted, non-overlapping [start, end) ranges that differ from the original
+        self.dirty = []
+        # Ranges changed since the last validate() call
+        self._unvalidated = [(0, EEPROM_SIZE)]
+        self._findings = {}
+
+    def __len__(self):
+        return EEPROM_SIZE
+
+    def __getitem__(self, key):
+        return bytes(self.data[key]) if isinstance(key, slice) else self.data[key]
+
+    def __bytes__(self):
+        return bytes(self.data)
+
+    def write(self, offset, values):
+        """Write bytes at `offset`; only bytes that actually change are marked dirty."""
+        if offset < 0 or offset + len(values) > EEPROM_SIZE:
+            raise ValueError(f"Write 0x{offset:03X}+{len(values)} is outside the EEPROM")
+        changed = []
+        for i, value in enumerate(values):
+            if self.data[offset + i] != value:
+                changed.append(offset + i)
+                self.data[offset + i] = value
+        for position in changed:
+            self._unvalidated.append((position, position + 1))
+        self._recompute_dirty(offset, offset + len(values))
+
+    def _recompute_dirty(self, start, end):
+        """Rebuild the dirty ranges inside [start, end) against the original image."""
+        ranges = [(s, e) for s, e in self.dirty if e <= start or s >= end]
+        # Keep the parts of ranges that straddle the window edges
+        for s, e in self.dirty:
+            if s < start < e:
+                ranges.append((s, start))
+            if s < end < e:
+                ranges.append((end, e))
+
+        i = start
+        while i < end:
+            if self.data[i] == self.original[i]:
+                i += 1
+                continue
+            run = i
+            while i < end and self.data[i] != self.original[i]:
+                i += 1
+            ranges.append((run, i))
+
+        self.dirty = _merge(ranges)
+
+    def dirty_words(self):
+        """Word addresses (0-255) that contain at least one changed byte."""
+        words = []
+        for start, end in self.dirty:
+            for word in range(start >> 1, ((end - 1) >> 1) + 1):
+                if not words or words[-1] != word:
+                    words.append(word)
+        return words
+
+    def write_plan(self):
+        """Minimal list of (word address, 16-bit value) writes to flash the changes."""
+        return [(word, word_value(self.data, word)) for word in self.dirty_words()]
+
+    def validate(self):
+        """
+        Re-run only the validation rules that read bytes changed since the
+        last call, and return the combined findings for the whole image.
+        """
+        names = set()
+        for start, end in _merge(self._unvalidated):
+            names.update(rules_touching(start, end))
+        self._unvalidated = []
+
+        if names:
+            for name in names:
+                self._findings.pop(name, None)
+            for finding in check_image(self.data, names):
+                self._findings[finding[0]] = finding
+        return list(self._findings.values())
+
+
+def _merge(ranges):
+    """Merge overlapping or adjacent [start, end) ranges."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def encode_patch(image):
+    """Serialize an image's write plan, tied to its original dump, into the .acup format."""
+    out = bytearray(PATCH_MAGIC)
+    out += hashlib.sha256(image.original).digest()
+    for word, value in image.write_plan():
+        out += bytes([word, value >> 8, value & 0xFF])
+    return bytes(out)
+
+
+def decode_patch(blob):
+    """Parse a .acup patch into (SHA-256 of the base dump, write plan)."""
+    if not blob.startswith(PATCH_MAGIC) or len(blob) < PATCH_HEADER or (len(blob) - PATCH_HEADER) % 3:
+        raise ValueError("Not a 93LC66 patch file")
+    body = blob[PATCH_HEADER:]
+    plan = [(body[i], (body[i + 1] << 8) | body[i + 2]) for i in range(0, len(body), 3)]
+    return blob[len(PATCH_MAGIC):PATCH_HEADER], plan
+
+
+def apply_plan(image, plan):
+    """Apply a word write plan to an EepromImage."""
+    for word, value in plan:
+        image.write(2 * word, word_bytes(value))
+    return image
+
+
+def apply_patch(image, blob):
+    """Apply a .acup patch to an EepromImage, refusing a dump it was not made from."""
+    base, plan = decode_patch(blob)
+    if hashlib.sha256(image.original).digest() != base:
+        raise ValueError("Patch was made for a different dump (base image hash does not match)")
+    return apply_plan(image, plan)
+
+
+def print_plan(image):
+    """Print the dirty ranges and word writes of an image."""
+    changed = sum(end - start for start, end in image.dirty)
+    plan = image.write_plan()
+    print(f"\nMinimal write plan: {changed} bytes changed in {len(plan)} of {WORD_COUNT} words")
+    for start, end in image.dirty:
+        print(f"  0x{start:03X}-0x{end - 1:03X} ({end - start} bytes)")
+    for word, value in plan:
+        print(f"  word 0x{word:02X} (byte 0x{2 * word:03X}) <- 0x{value:04X}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Porsche 986/996 ACU EEPROM minimal write plan',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python3 eeprom_image.py plan locked.bin unlocked.bin --patch unlock.acup
+    python3 eeprom_image.py apply locked.bin unlock.acup unlocked.bin
+        """
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    plan_parser = commands.add_parser('plan', help='Show the words that differ between two dumps')
+    plan_parser.add_argument('original', help='EEPROM dump currently on the chip')
+    plan_parser.add_argument('modified', help='EEPROM dump you want on the chip')
+    plan_parser.add_argument('--patch', '-p', help='Write the plan as a compact .acup patch file')
+
+    apply_parser = commands.add_parser('apply', help='Apply a .acup patch to a dump')
+    apply_parser.add_argument('original', help='EEPROM dump the patch was made against')
+    apply_parser.add_argument('patch', help='Patch file (.acup)')
+    apply_parser.add_argument('output', help='Output EEPROM file')
+
+    args = parser.parse_args()
+
+    try:
+        image = EepromImage(read_dump(args.original))
+        if args.command == 'plan':
+            image.write(0, read_dump(args.modified))
+            print_plan(image)
+            if args.patch:
+                with open(args.patch, 'wb') as f:
+                    f.write(encode_patch(image))
+                print(f"\n✓ Patch saved to: {args.patch}")
+        else:
+            with open(args.patch, 'rb') as f:
+                apply_patch(image, f.read())
+            print_plan(image)
+            with open(args.output, 'wb') as f:
+                f.write(bytes(image))
+            print(f"\n✓ Patched EEPROM saved to: {args.output}")
+    except FileNotFoundError as e:
+        print(f"Error: File not found - {e.filename}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
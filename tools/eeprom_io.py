@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Porsche 986/996 ACU EEPROM Dump Reader
+Reads dumps from plain files, folders and zip/tar(.gz) bundles without
+extracting them to disk.
+
+Dumps inside an archive are named "<archive>:<member>", for example:
+
+    bundle.zip:acu/boxster.bin
+    forum_dumps.tar.gz:2003/locked.bin
+
+That name can be passed to any tool that reads dumps through this module
+(eeprom_analyzer.py, eeprom_rules.py) to open a single member directly.
+
+Archives are read as streams: tar bundles are walked member by member with
+tarfile's stream mode, and zip members are decompressed one at a time, so
+memory stays bounded by MAX_DUMP_SIZE per member rather than the bundle size.
+Reading is spread over worker threads (zlib releases the GIL while
+decompressing): the members of a zip are split into slices so even a single
+bundle is read in parallel, while each tar stream is read by one worker,
+since a compressed tar can only be decompressed front to back.
+
+Repository: https://github.com/alexvnesta/porsche-986-immobilizer-guide
+"""
+
+import os
+import queue
+import tarfile
+import zipfile
+import threading
+
+# Largest member that is still treated as an EEPROM dump (raw dumps with
+# programmer headers and 1K ECU images are well below this)
+MAX_DUMP_SIZE = 64 * 1024
+
+DUMP_EXTENSIONS = ('.bin', '.eep', '.rom')
+ARCHIVE_EXTENSIONS = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+
+
+def is_archive(path):
+    """True if the path names a supported archive."""
+    return path.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def is_dump_name(name):
+    """True if a file or member name looks like an EEPROM dump."""
+    return name.lower().endswith(DUMP_EXTENSIONS)
+
+
+def split_member(name):
+    """Split "<archive>:<member>" into (archive, member); member is None for plain paths."""
+    lower = name.lower()
+    for ext in ARCHIVE_EXTENSIONS:
+        marker = ext + ':'
+        index = lower.find(marker)
+        if index != -1:
+            cut = index + len(ext)
+            return name[:cut], name[cut + 1:]
+    return name, None
+
+
+def _zip_dumps(archive):
+    """The dump-sized members of an open zip archive."""
+    return [info for info in archive.infolist()
+            if not info.is_dir() and is_dump_name(info.filename) and info.file_size <= MAX_DUMP_SIZE]
+
+
+def _iter_zip(path, infos=None):
+    """Yield (name, data) for each dump-sized member of a zip archive (or just `infos`)."""
+    with zipfile.ZipFile(path) as archive:
+        for info in _zip_dumps(archive) if infos is None else infos:
+            with archive.open(info) as member:
+                yield f"{path}:{info.filename}", member.read(MAX_DUMP_SIZE)
+
+
+def _iter_tar(path):
+    """Yield (name, data) for each dump-sized member of a tar archive, in one streaming pass."""
+    with tarfile.open(path, 'r|*') as archive:
+        for info in archive:
+            if not info.isfile() or not is_dump_name(info.name) or info.size > MAX_DUMP_SIZE:
+                continue
+            member = archive.extractfile(info)
+            yield f"{path}:{info.name}", member.read(MAX_DUMP_SIZE)
+
+
+def expand_sources(paths):
+    """Expand folders into the dump files and archives they contain."""
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                sources.extend(os.path.join(root, name) for name in sorted(names)
+                               if is_archive(name) or is_dump_name(name))
+        else:
+            sources.append(path)
+    return sources
+
+
+def iter_source(path):
+    """Yield (name, data) for every dump in a single file or archive."""
+    if not is_archive(path):
+        yield path, read_dump(path)
+    elif path.lower().endswith('.zip'):
+        yield from _iter_zip(path)
+    else:
+        yield from _iter_tar(path)
+
+
+def read_dump(name):
+    """
+    Read one dump from a plain path or an "<archive>:<member>" name.
+    Archive members larger than MAX_DUMP_SIZE raise ValueError.
+    """
+    path, member = split_member(name)
+    if member is None:
+        with open(path, 'rb') as f:
+            return f.read()
+
+    if path.lower().endswith('.zip'):
+        with zipfile.ZipFile(path) as archive:
+            try:
+                info = archive.getinfo(member)
+            except KeyError:
+                raise FileNotFoundError(2, 'No such archive member', name)
+            _check_member_size(name, info.file_size)
+            with archive.open(info) as f:
+                return f.read(MAX_DUMP_SIZE)
+
+    with tarfile.open(path, 'r:*') as archive:
+        try:
+            info = archive.getmember(member)
+            f = archive.extractfile(info)
+        except KeyError:
+            f = None
+        if f is None:
+            raise FileNotFoundError(2, 'No such archive member', name)
+        _check_member_size(name, info.size)
+        return f.read(MAX_DUMP_SIZE)
+
+
+def _check_member_size(name, size):
+    if size > MAX_DUMP_SIZE:
+        raise ValueError(f"{name} is {size} bytes - too large for an EEPROM dump (limit {MAX_DUMP_SIZE})")
+
+
+def _work_items(paths, workers):
+    """
+    Split sources into units of work: (path, None) reads a whole file or tar,
+    (path, infos) reads one slice of a zip's members.
+    """
+    items = []
+    for path in paths:
+        if not path.lower().endswith('.zip'):
+            items.append((path, None))
+            continue
+        with zipfile.ZipFile(path) as archive:
+            infos = _zip_dumps(archive)
+        step = max(1, -(-len(infos) // workers))
+        items.extend((path, infos[i:i + step]) for i in range(0, len(infos), step))
+    return items
+
+
+def iter_dumps(paths, workers=4):
+    """
+    Yield (name, data) for every dump found under `paths`.
+
+    Folders are expanded first; each file, tar archive or slice of a zip's
+    members is read by one of the worker threads, and results are handed
+    over through a bounded queue so a slow consumer never buffers whole
+    bundles. Order is not guaranteed. Errors raised by a worker are
+    re-raised here.
+    """
+    paths = expand_sources(paths)
+    if workers <= 1:
+        for path in paths:
+            yield from iter_source(path)
+        return
+
+    items = _work_items(paths, workers)
+    if len(items) <= 1:
+        for path, infos in items:
+            yield from (iter_source(path) if infos is None else _iter_zip(path, infos))
+        return
+
+    results = queue.Queue(maxsize=256)
+    pending = queue.Queue()
+    for item in items:
+        pending.put(item)
+
+    def worker():
+        while True:
+            try:
+                path, infos = pending.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                for item in iter_source(path) if infos is None else _iter_zip(path, infos):
+                    results.put(item)
+            except Exception as e:
+                results.put(e)
+        results.put(None)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(min(workers, len(items)))]
+    for thread in threads:
+        thread.start()
+
+    finished = 0
+    while finished < len(threads):
+        item = results.get()
+        if item is None:
+            finished += 1
+        elif isinstance(item, Exception):
+            raise item
+        else:
+            yield item
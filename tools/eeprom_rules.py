@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Porsche 986/996 ACU EEPROM Validation Rules
+Runs a set of registered validation rules over one dump or a whole corpus.
+
+Usage:
+    python3 eeprom_rules.py <dump.bin|folder|archive> [...] [--min-severity warning]
+    python3 eeprom_rules.py --list
+
+Examples:
+    # QA pass over the whole dump archive
+    python3 eeprom_rules.py dumps/acu
+
+    # Check dumps straight out of customer bundles (no extraction needed)
+    python3 eeprom_rules.py bundle.zip forum_dumps.tar.gz
+
+    # Only show per-rule statistics, no per-file findings
+    python3 eeprom_rules.py dumps/ --stats-only
+
+How it works:
+    Every 512-byte image is stacked end to end into one buffer. Byte N of
+    every dump is then a single strided slice of that buffer (a "column"),
+    so each rule is evaluated for all dumps at once with a handful of C-level
+    bytes operations instead of a Python loop per dump. Rules return a mask
+    with one byte per dump (1 = rule fired).
+
+    Images that are not 512 bytes only get the size check - the layout
+    rules assume the 93LC66 memory map.
+
+Repository: https://github.com/alexvnesta/porsche-986-immobilizer-guide
+"""
+
+import sys
+import time
+import tarfile
+import zipfile
+import argparse
+
+from eeprom_io import iter_dumps
+from eeprom_scan import realign
+
+EEPROM_SIZE = 512
+
+# Severity levels, most severe first
+ERROR = 'error'
+WARNING = 'warning'
+INFO = 'info'
+SEVERITY_ORDER = {ERROR: 0, WARNING: 1, INFO: 2}
+
+# Registered rules, in evaluation order: (name, severity, message, function)
+RULES = []
+
+# (offset, length) ranges each rule reads; rules without an entry read the whole image
+RULE_REGIONS = {}
+
+
+def rule(name, severity, message, regions=None):
+    """Register a validation rule. The function takes (stack, count) and returns a mask."""
+    def register(func):
+        RULES.append((name, severity, message, func))
+        if regions is not None:
+            RULE_REGIONS[name] = regions
+        return func
+    return register
+
+
+def rules_touching(start, end):
+    """Names of the rules that read any byte in [start, end)."""
+    names = []
+    for name, _, _, _ in RULES:
+        regions = RULE_REGIONS.get(name)
+        if regions is None or any(offset < end and start < offset + length for offset, length in regions):
+            names.append(name)
+    return names
+
+
+# --- Column / mask helpers -------------------------------------------------
+
+def _column(stack, offset):
+    """Byte at `offset` of every image in the stack."""
+    return stack[offset::EEPROM_SIZE]
+
+
+def _table(values):
+    """Translate table mapping the given byte values to 1 and everything else to 0."""
+    table = bytearray(256)
+    for value in values:
+        table[value] = 1
+    return bytes(table)
+
+
+_NONZERO = bytes([0] + [1] * 255)
+
+
+def _and(a, b):
+    return (int.from_bytes(a, 'big') & int.from_bytes(b, 'big')).to_bytes(len(a), 'big')
+
+
+def _or(a, b):
+    return (int.from_bytes(a, 'big') | int.from_bytes(b, 'big')).to_bytes(len(a), 'big')
+
+
+def _not(a):
+    return a.translate(_table([0]))
+
+
+def _field_in(stack, count, offset, length, values):
+    """Mask of images where every byte in the field is one of `values`."""
+    table = _table(values)
+    mask = b'\x01' * count
+    for i in range(length):
+        mask = _and(mask, _column(stack, offset + i).translate(table))
+    return mask
+
+
+def _field_equals(stack, count, offset, pattern):
+    """Mask of images where the field at `offset` equals `pattern`."""
+    mask = b'\x01' * count
+    for i, value in enumerate(pattern):
+        mask = _and(mask, _column(stack, offset + i).translate(_table([value])))
+    return mask
+
+
+def _field_count(stack, count, offset, length, values):
+    """Per-image count of bytes in the field that are one of `values` (length < 256)."""
+    table = _table(values)
+    total = 0
+    # Each image owns one byte lane of the integer, so the additions never carry
+    for i in range(length):
+        total += int.from_bytes(_column(stack, offset + i).translate(table), 'big')
+    return total.to_bytes(count, 'big')
+
+
+def _fields_differ(stack, count, offset_a, offset_b, length):
+    """Mask of images where the two fields are not identical."""
+    diff = 0
+    for i in range(length):
+        diff |= (int.from_bytes(_column(stack, offset_a + i), 'big') ^
+                 int.from_bytes(_column(stack, offset_b + i), 'big'))
+    return diff.to_bytes(count, 'big').translate(_NONZERO)
+
+
+def _contains(stack, count, offset, length, pattern):
+    """Mask of images where `pattern` appears anywhere inside the field."""
+    mask = bytes(count)
+    for start in range(offset, offset + length - len(pattern) + 1):
+        mask = _or(mask, _field_equals(stack, count, start, pattern))
+    return mask
+
+
+def _hits(mask):
+    """Indices of images whose mask byte is set."""
+    indices = []
+    i = mask.find(1)
+    while i != -1:
+        indices.append(i)
+        i = mask.find(1, i + 1)
+    return indices
+
+
+# --- Rules -----------------------------------------------------------------
+
+@rule('blank-read', ERROR, "Data is all 0x00 or all 0xFF - likely erased or bad read")
+def rule_blank_read(stack, count):
+    return _or(_field_in(stack, count, 0, EEPROM_SIZE, [0x00]),
+               _field_in(stack, count, 0, EEPROM_SIZE, [0xFF]))
+
+
+@rule('pin-mirror', ERROR, "PIN codes at 0x1EE and 0x1F7 don't match - possible corruption",
+      [(0x1EE, 3), (0x1F7, 3)])
+def rule_pin_mirror(stack, count):
+    return _fields_differ(stack, count, 0x1EE, 0x1F7, 3)
+
+
+@rule('pin-erased', ERROR, "PIN at 0x1EE is erased (FF FF FF or 00 00 00) - data lost",
+      [(0x1EE, 3)])
+def rule_pin_erased(stack, count):
+    return _or(_field_in(stack, count, 0x1EE, 3, [0xFF]),
+               _field_in(stack, count, 0x1EE, 3, [0x00]))
+
+
+@rule('pairing-mirror', WARNING, "ECU pairing codes at 0x1F1 and 0x1FA don't match",
+      [(0x1F1, 6), (0x1FA, 6)])
+def rule_pairing_mirror(stack, count):
+    return _fields_differ(stack, count, 0x1F1, 0x1FA, 6)
+
+
+@rule('config-mirror', WARNING, "Config blocks at 0x020 and 0x050 differ",
+      [(0x020, 0x60)])
+def rule_config_mirror(stack, count):
+    return _fields_differ(stack, count, 0x020, 0x050, 48)
+
+
+@rule('transponder-mirror', INFO, "Transponder blocks at 0x0BA and 0x0CE differ",
+      [(0x0BA, 40)])
+def rule_transponder_mirror(stack, count):
+    return _fields_differ(stack, count, 0x0BA, 0x0CE, 20)
+
+
+@rule('erased-region', WARNING, "Config, OBD or sync region is erased (all 0xFF) - stuck or bad read",
+      [(0x020, 0x60), (0x080, 0x10), (0x1B0, 0x10)])
+def rule_erased_region(stack, count):
+    mask = bytes(count)
+    for offset, length in ((0x020, 0x60), (0x080, 0x10), (0x1B0, 0x10)):
+        mask = _or(mask, _field_in(stack, count, offset, length, [0xFF]))
+    return mask
+
+
+@rule('obd-flags', WARNING, "Unrecognized OBD flag pattern at 0x080/0x083",
+      [(0x080, 5)])
+def rule_obd_flags(stack, count):
+    unlocked = _and(_field_equals(stack, count, 0x080, b'\xF6\x0A'),
+                    _field_equals(stack, count, 0x083, b'\xF6\x0A'))
+    locked = _or(_field_equals(stack, count, 0x080, b'\x00\x00'),
+                 _field_equals(stack, count, 0x083, b'\x55\x55'))
+    return _not(_or(unlocked, locked))
+
+
+# Programmed slots in the sample dumps never carry more than six 0xFF bytes
+MAX_PROGRAMMED_FF = 6
+
+
+@rule('remote-slot', WARNING, "Remote slot is all zeros or partially erased - impossible contents",
+      [(0x100, 48)])
+def rule_remote_slot(stack, count):
+    mask = bytes(count)
+    for offset in (0x100, 0x10C, 0x118, 0x124):
+        zeros = _field_in(stack, count, offset, 12, [0x00])
+        empty = _field_in(stack, count, offset, 12, [0xFF, 0xB7, 0x06])
+        erased = _field_count(stack, count, offset, 12, [0xFF]).translate(
+            bytes(1 if n > MAX_PROGRAMMED_FF else 0 for n in range(256)))
+        mask = _or(mask, _or(zeros, _and(erased, _not(empty))))
+    return mask
+
+
+@rule('part-number', WARNING, "Part number at 0x009 is not 99 66 18 26 (00|20) xx - byte-swapped or bad read",
+      [(0x009, 5)])
+def rule_part_number(stack, count):
+    return _not(_and(_field_equals(stack, count, 0x009, b'\x99\x66\x18\x26'),
+                     _field_in(stack, count, 0x00D, 1, [0x00, 0x20])))
+
+
+@rule('sync-pattern', INFO, "Sync pattern B2 22 D4 not found in 0x1B0-0x1BF",
+      [(0x1B0, 16)])
+def rule_sync_pattern(stack, count):
+    return _not(_contains(stack, count, 0x1B0, 16, b'\xB2\x22\xD4'))
+
+
+# --- Runners ---------------------------------------------------------------
+
+def run_batch(images, only=None):
+    """
+    Evaluate all rules (or just the rule names in `only`) over a list of images.
+    Returns one list of (rule, severity, message) findings per image.
+    """
+    findings = [[] for _ in images]
+    sized = []
+    for i, data in enumerate(images):
+        if len(data) == EEPROM_SIZE:
+            sized.append(i)
+        else:
+            findings[i].append(('size', ERROR, f"Size is {len(data)} bytes, expected {EEPROM_SIZE}"))
+
+    if not sized:
+        return findings
+
+    stack = b''.join(images[i] for i in sized)
+    for name, severity, message, func in RULES:
+        if only is not None and name not in only:
+            continue
+        for hit in _hits(func(stack, len(sized))):
+            findings[sized[hit]].append((name, severity, message))
+
+    return findings
+
+
+def check_image(data, only=None):
+    """Evaluate all rules (or just the rule names in `only`) over a single image."""
+    return run_batch([bytes(data)], only)[0]
+
+
+def rule_statistics(findings):
+    """Count how many images each rule fired on."""
+    stats = {'size': 0}
+    stats.update((name, 0) for name, _, _, _ in RULES)
+    for image_findings in findings:
+        for name in {name for name, _, _ in image_findings}:
+            stats[name] += 1
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Porsche 986/996 ACU EEPROM Validation Rules',
+        epilog='Example: python3 eeprom_rules.py dumps/acu --min-severity warning'
+    )
+    parser.add_argument('paths', nargs='*', help='EEPROM dump files, folders or zip/tar archives')
+    parser.add_argument('--min-severity', choices=list(SEVERITY_ORDER), default=INFO,
+                        help='Hide findings below this severity')
+    parser.add_argument('--stats-only', action='store_true', help='Only print per-rule statistics')
+    parser.add_argument('--workers', '-j', type=int, default=4, help='Parallel readers for files and archives')
+    parser.add_argument('--realign', action='store_true',
+                        help='Realign shifted, wrapped or byte-swapped reads before checking')
+    parser.add_argument('--list', action='store_true', help='List registered rules and exit')
+
+    args = parser.parse_args()
+
+    if args.list:
+        for name, severity, message, _ in RULES:
+            print(f"  {name:<20} {severity:<8} {message}")
+        sys.exit(0)
+
+    if not args.paths:
+        parser.error('at least one dump file or folder is required')
+
+    try:
+        dumps = sorted(iter_dumps(args.paths, workers=args.workers))
+    except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+        print(f"Error: Cannot read dumps - {e}")
+        sys.exit(1)
+    files = [name for name, _ in dumps]
+    images = [data for _, data in dumps]
+
+    if args.realign:
+        for i, data in enumerate(images):
+            try:
+                image, info = realign(data)
+                # Inconsistent reads are checked as read; realigning would break the correct parts
+                if not info['conflict']:
+                    images[i] = image
+            except ValueError:
+                pass
+
+    start = time.perf_counter()
+    findings = run_batch(images)
+    elapsed = time.perf_counter() - start
+
+    limit = SEVERITY_ORDER[args.min_severity]
+
+    print("=" * 70)
+    print("PORSCHE 986/996 ACU EEPROM VALIDATION")
+    print("=" * 70)
+    print(f"Dumps: {len(images)}    Rules: {len(RULES) + 1}    Time: {elapsed * 1000:.1f} ms")
+
+    if not args.stats_only:
+        for path, image_findings in zip(files, findings):
+            shown = [f for f in image_findings if SEVERITY_ORDER[f[1]] <= limit]
+            if not shown:
+                continue
+            print(f"\n{path}")
+            for name, severity, message in sorted(shown, key=lambda f: SEVERITY_ORDER[f[1]]):
+                print(f"  [{severity.upper():<7}] {name}: {message}")
+
+    print("\n[RULE STATISTICS]")
+    print("-" * 40)
+    severities = {'size': ERROR}
+    severities.update((name, severity) for name, severity, _, _ in RULES)
+    for name, hits in rule_statistics(findings).items():
+        percent = 100.0 * hits / len(images) if images else 0.0
+        print(f"  {name:<20} {severities[name]:<8} {hits:>6} ({percent:5.1f}%)")
+
+    errors = sum(1 for image_findings in findings if any(f[1] == ERROR for f in image_findings))
+    print(f"\n{len(images) - errors}/{len(images)} dumps passed error-level checks")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Porsche 986/996 ACU EEPROM Signature Scanner
+Finds known anchors in a shifted, truncated, wrapped or byte-swapped read
+and realigns it to the standard 512-byte 93LC66 layout.
+
+Usage:
+    python3 eeprom_scan.py <dump.bin> [--output realigned.bin]
+
+Why:
+    Every decoder assumes fixed offsets. A read that starts a few bytes late,
+    wraps around the end of the chip, or was taken in 16-bit mode (byte pairs
+    swapped) makes the PIN, OBD status and slot decoding silently wrong.
+
+How it works:
+    All anchors are compiled into a single regular expression and found in
+    one pass over the buffer. Each hit votes for an offset delta
+    (buffer position - expected EEPROM offset), weighted by how reliable the
+    anchor is. The winning delta and byte order are used to rebuild the image.
+
+    If anchors in the other byte order also reach MIN_SCORE, the read is
+    reported as inconsistent instead: part of the image agrees with an
+    8-bit read and part with a 16-bit one, so no single realignment fixes it
+    and applying the winning one would break the regions that were correct.
+
+    Anchor                  Expected offset
+    Part header 99 66 18 26    0x009
+    OBD flags (unlocked)       0x080   F6 0A 00 F6 0A
+    OBD flags (locked)         0x080   00 00 55 00 00 55
+    Sync B2 22 D4 B2 22 D4     0x1B5
+    Empty remote slot          0x100 / 0x10C / 0x118 / 0x124
+    PIN + pairing mirror       0x1EE   9 bytes repeated at 0x1F7
+
+    Each anchor also has a byte-swapped form for dumps read in 16-bit mode.
+
+Repository: https://github.com/alexvnesta/porsche-986-immobilizer-guide
+"""
+
+import re
+import sys
+import argparse
+
+from eeprom_io import read_dump
+
+EEPROM_SIZE = 512
+
+# Minimum vote weight before an alignment is trusted
+MIN_SCORE = 3
+
+# (name, regex, expected offsets, weight, byte-swapped)
+# Swapped patterns start on the even word boundary at or before the anchor.
+ANCHORS = [
+    ('part-header', rb'\x99\x66\x18\x26', (0x009,), 4, False),
+    ('part-header', rb'\x99.\x18\x66[\x00\x20]\x26', (0x008,), 4, True),
+    ('obd-unlocked', rb'\xF6\x0A\x00\xF6\x0A', (0x080,), 3, False),
+    ('obd-unlocked', rb'\x0A\xF6\xF6\x00\x00\x0A', (0x080,), 3, True),
+    ('obd-locked', rb'\x00\x00\x55\x00\x00\x55', (0x080,), 2, False),
+    ('obd-locked', rb'\x00\x00\x00\x55\x55\x00', (0x080,), 2, True),
+    ('sync', rb'\xB2\x22\xD4\xB2\x22\xD4', (0x1B5,), 3, False),
+    ('sync', rb'\xB2.\xD4\x22\x22\xB2.\xD4', (0x1B4,), 3, True),
+    ('empty-slot', rb'\xFF{8}\xB7\xFF{3}', (0x100, 0x10C, 0x118, 0x124), 1, False),
+    ('empty-slot', rb'\xFF\xFF\xB7\xFF{5}\x06\xFF{3}', (0x100, 0x10C, 0x118, 0x124), 1, False),
+    ('empty-slot', rb'\xFF{8}\xFF\xB7\xFF{2}', (0x100, 0x10C, 0x118, 0x124), 1, True),
+    ('empty-slot', rb'\xFF\xFF\xFF\xB7\xFF{4}\xFF\x06\xFF{2}', (0x100, 0x10C, 0x118, 0x124), 1, True),
+    # 9 bytes (PIN + pairing) immediately repeated, excluding erased/zero runs
+    ('pin-mirror', rb'(?!(?P<u>.)(?P=u){8})(?P<m>.{9})(?P=m)', (0x1EE,), 4, False),
+]
+
+
+def _compile_anchors():
+    """Join all anchors into one zero-width alternation so overlapping hits are all reported."""
+    parts = [b'(?P<a%d>%s)' % (index, pattern) for index, (_, pattern, _, _, _) in enumerate(ANCHORS)]
+    return re.compile(b'(?=' + b'|'.join(parts) + b')', re.DOTALL)
+
+
+_SCANNER = _compile_anchors()
+
+
+def find_anchors(buf):
+    """Return (name, position, anchor index) for every anchor hit in the buffer."""
+    hits = []
+    for match in _SCANNER.finditer(buf):
+        # The outer anchor group is the last one to close
+        index = int(match.lastgroup[1:])
+        hits.append((ANCHORS[index][0], match.start(), index))
+    return hits
+
+
+def infer_alignment(buf):
+    """
+    Work out how the buffer maps onto the EEPROM.
+    Returns (delta, swapped, score, hits, conflict) where buffer[i] holds
+    EEPROM byte i - delta and conflict is the best score for the other byte
+    order if that is strong enough to be real (0 otherwise), or None if the
+    anchors found are too weak to decide.
+    """
+    hits = find_anchors(buf)
+
+    # An anchor that hits far more often than it has expected offsets is
+    # matching filler (zero runs, text dumps) rather than real structure
+    counts = {}
+    for _, _, index in hits:
+        counts[index] = counts.get(index, 0) + 1
+
+    votes = {}
+    for _, position, index in hits:
+        _, _, offsets, weight, swapped = ANCHORS[index]
+        if counts[index] > 2 * len(offsets):
+            continue
+        for offset in offsets:
+            delta = position - offset
+            if len(buf) == EEPROM_SIZE:
+                # A full-length read can only have wrapped: fold to the nearest rotation
+                delta = (delta + EEPROM_SIZE // 2) % EEPROM_SIZE - EEPROM_SIZE // 2
+            key = (delta, swapped)
+            votes[key] = votes.get(key, 0) + weight
+
+    if not votes:
+        return None
+
+    (delta, swapped), score = max(votes.items(), key=lambda item: (item[1], -abs(item[0][0])))
+    if score < MIN_SCORE:
+        return None
+    conflict = max((weight for (_, other), weight in votes.items() if other != swapped), default=0)
+    return delta, swapped, score, hits, conflict if conflict >= MIN_SCORE else 0
+
+
+def _swap_words(data):
+    """Swap adjacent byte pairs (16-bit read back to 8-bit layout)."""
+    data = bytearray(data)
+    data[0::2], data[1::2] = data[1::2], data[0::2]
+    return bytes(data)
+
+
+def realign(buf, fill=0xFF):
+    """
+    Realign a buffer to the standard 512-byte layout.
+    Returns (image, info) where info holds delta, swapped, mode, score,
+    conflict (see infer_alignment; callers should not trust the image when
+    it is non-zero) and the list of (start, end) EEPROM ranges that were not
+    present in the read. Raises ValueError if the alignment cannot be
+    determined.
+    """
+    alignment = infer_alignment(buf)
+    if alignment is None:
+        raise ValueError("Too few known anchors found - cannot determine alignment")
+    delta, swapped, score, hits, conflict = alignment
+
+    image = bytearray([fill]) * EEPROM_SIZE
+    present = bytearray(EEPROM_SIZE)
+    if len(buf) == EEPROM_SIZE and delta != 0:
+        # Same length as the chip: the read started mid-chip and wrapped around
+        mode = 'rotation'
+        start = delta % EEPROM_SIZE
+        image[:] = buf[start:] + buf[:start]
+        present[:] = b'\x01' * EEPROM_SIZE
+    else:
+        mode = 'shift' if delta else 'aligned'
+        first = max(0, delta)
+        last = min(len(buf), EEPROM_SIZE + delta)
+        if last > first:
+            image[first - delta:last - delta] = buf[first:last]
+            present[first - delta:last - delta] = b'\x01' * (last - first)
+
+    if swapped:
+        image = bytearray(_swap_words(image))
+        present = bytearray(_swap_words(present))
+
+    missing = []
+    i = present.find(0)
+    while i != -1:
+        end = present.find(1, i)
+        end = EEPROM_SIZE if end == -1 else end
+        missing.append((i, end))
+        i = present.find(0, end)
+
+    info = {
+        'delta': delta,
+        'swapped': swapped,
+        'mode': mode,
+        'score': score,
+        'conflict': conflict,
+        'anchors': sorted({name for name, _, _ in hits}),
+        'missing': missing,
+    }
+    return bytes(image), info
+
+
+def describe_alignment(info):
+    """One-line summary of a realign() result."""
+    parts = [info['mode']]
+    if info['delta']:
+        parts.append(f"delta {info['delta']:+d} bytes")
+    if info['swapped']:
+        parts.append("16-bit byte-swapped")
+    if info['missing']:
+        missing = sum(end - start for start, end in info['missing'])
+        parts.append(f"{missing} bytes missing")
+    if info['conflict']:
+        other = '8-bit' if info['swapped'] else '16-bit byte-swapped'
+        parts.append(f"but {other} anchors also score {info['conflict']}")
+    return ', '.join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Porsche 986/996 ACU EEPROM Signature Scanner',
+        epilog='Example: python3 eeprom_scan.py bad_clip_read.bin --output fixed.bin'
+    )
+    parser.add_argument('eeprom', help='EEPROM dump file (any length) or archive.zip:member')
+    parser.add_argument('--output', '-o', help='Write the realigned 512-byte image here')
+
+    args = parser.parse_args()
+
+    try:
+        buf = read_dump(args.eeprom)
+    except FileNotFoundError as e:
+        print(f"Error: File not found - {e.filename}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print("=" * 60)
+    print("PORSCHE 986/996 ACU EEPROM SIGNATURE SCAN")
+    print("=" * 60)
+    print(f"Input: {args.eeprom} ({len(buf)} bytes)")
+
+    try:
+        image, info = realign(buf)
+    except ValueError as e:
+        print(f"\nError: {e}")
+        sys.exit(1)
+
+    print(f"\nAnchors found: {', '.join(info['anchors'])}")
+    print(f"Alignment:     {describe_alignment(info)} (score {info['score']})")
+    for start, end in info['missing']:
+        print(f"  ⚠ Not covered by read: 0x{start:03X}-0x{end - 1:03X}")
+    if info['conflict']:
+        print("  ⚠ Inconsistent read: anchors vote for both byte orders - no single realignment")
+        print("    fixes it. Re-read the chip rather than trusting a realigned image.")
+        if args.output:
+            print("\nNot writing the realigned image")
+            sys.exit(1)
+
+    if args.output:
+        with open(args.output, 'wb') as f:
+            f.write(image)
+        print(f"\n✓ Realigned EEPROM saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Porsche 986/996 ACU Microwire Bus Decoder
+Rebuilds a 93LC66 EEPROM image from a logic-analyzer capture of the chip's
+bus (CS, CLK, DI, DO) taken while the ACU boots.
+
+Usage:
+    python3 microwire_decode.py <capture.csv|capture.vcd> <output.bin> [--org 16]
+
+Examples:
+    # Saleae/sigrok CSV export with columns named CS, CLK, DI, DO
+    python3 microwire_decode.py boot.csv sniffed.bin
+
+    # VCD with different signal names, chip strapped for 8-bit organization
+    python3 microwire_decode.py boot.vcd sniffed.bin --org 8 --cs CE --clk SK
+
+    # Then analyze the result like any other dump
+    python3 eeprom_analyzer.py sniffed.bin
+
+Why:
+    When a chip cannot be read reliably in-circuit, sniffing the ACU's own
+    reads at power-up still recovers most (usually all) of the EEPROM.
+
+How it works:
+    Captures are read in fixed-size chunks, so memory use does not grow with
+    the file. In CSV captures each channel of a chunk is one strided slice of
+    the row text, and clock/chip-select edges are found with a regex over
+    that slice - only the edges, not every sample, reach Python code. VCD
+    files already list only changes, so they are walked change by change.
+
+    READ, WRITE, ERASE, ERAL, WRAL, EWEN and EWDS are decoded. Words seen on
+    the bus are placed into a 512-byte image in the same byte order as an
+    AsProgrammer/CH341A 8-bit read, so the analyzer and the other tools can
+    use it directly: with 16-bit organization word N lands in bytes 2N, 2N+1
+    with its low byte first (word_bytes() in eeprom_image.py, see
+    "Byte-Swapping" in docs/EEPROM_MAP.md). Bytes never seen are left as
+    0xFF and reported in the coverage map.
+
+    The chip powers up write-disabled. WRITE, ERASE, ERAL and WRAL only
+    change the image between EWEN and EWDS; commands sent while disabled are
+    counted as ignored. Use --write-enabled if the capture starts after the
+    ACU had already sent EWEN.
+
+Repository: https://github.com/alexvnesta/porsche-986-immobilizer-guide
+"""
+
+import re
+import sys
+import argparse
+
+from eeprom_image import word_bytes
+
+EEPROM_SIZE = 512
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# Coverage map values
+UNSEEN = 0
+READ = 1
+WRITTEN = 2
+
+DEFAULT_NAMES = {
+    'cs': ('cs', 'ce', 'ncs'),
+    'clk': ('clk', 'sk', 'sck', 'clock'),
+    'di': ('di', 'mosi', 'din'),
+    'do': ('do', 'miso', 'dout'),
+}
+
+
+class MicrowireDecoder:
+    """Bit-level 93LC66 protocol decoder that assembles the observed contents."""
+
+    def __init__(self, org=16, write_enabled=False):
+        self.org = org
+        self.write_enabled = write_enabled
+        self.address_bits = 8 if org == 16 else 9
+        self.data_bits = org
+        self.unit = org // 8
+        self.image = bytearray(b'\xFF' * EEPROM_SIZE)
+        self.coverage = bytearray(EEPROM_SIZE)
+        self.counts = {name: 0 for name in ('READ', 'WRITE', 'ERASE', 'ERAL', 'WRAL', 'EWEN', 'EWDS')}
+        self.conflicts = 0
+        self.ignored = 0
+        self.frames = 0
+        self.bits = []
+        self.in_frame = False
+
+    def start_frame(self):
+        if self.in_frame:
+            self.end_frame()
+        self.in_frame = True
+        self.bits = []
+
+    def end_frame(self):
+        if self.in_frame and self.bits:
+            self.frames += 1
+            self._decode(self.bits)
+        self.in_frame = False
+        self.bits = []
+
+    def clock(self, di, do):
+        """One rising CLK edge with CS high."""
+        if self.in_frame:
+            self.bits.append((di, do))
+
+    def _store(self, address, value, source):
+        offset = (address * self.unit) % EEPROM_SIZE
+        data = word_bytes(value) if self.unit == 2 else bytes([value])
+        for i, byte in enumerate(data):
+            if self.coverage[offset + i] == READ and source == READ and self.image[offset + i] != byte:
+                self.conflicts += 1
+            self.image[offset + i] = byte
+            self.coverage[offset + i] = max(self.coverage[offset + i], source) if source == READ else WRITTEN
+
+    def _decode(self, bits):
+        # Leading zeros before the start bit are ignored
+        start = 0
+        while start < len(bits) and not bits[start][0]:
+            start += 1
+        header = bits[start + 1:start + 3 + self.address_bits]
+        if len(header) < 2 + self.address_bits:
+            return
+
+        opcode = header[0][0] << 1 | header[1][0]
+        address = 0
+        for di, _ in header[2:]:
+            address = address << 1 | di
+        body = bits[start + 3 + self.address_bits:]
+        words = (EEPROM_SIZE // self.unit)
+
+        if opcode == 0b10:
+            self.counts['READ'] += 1
+            # First DO bit is the dummy zero, then data words back to back
+            data = body[1:]
+            for n in range(len(data) // self.data_bits):
+                value = 0
+                for _, do in data[n * self.data_bits:(n + 1) * self.data_bits]:
+                    value = value << 1 | do
+                self._store((address + n) % words, value, READ)
+        elif opcode == 0b01:
+            self.counts['WRITE'] += 1
+            if len(body) >= self.data_bits and self._writable():
+                self._store(address, _bits_value(body[:self.data_bits]), WRITTEN)
+        elif opcode == 0b11:
+            self.counts['ERASE'] += 1
+            if self._writable():
+                self._store(address, (1 << self.data_bits) - 1, WRITTEN)
+        else:
+            # 00 commands are selected by the two top address bits
+            sub = address >> (self.address_bits - 2)
+            if sub == 0b11:
+                self.counts['EWEN'] += 1
+                self.write_enabled = True
+            elif sub == 0b00:
+                self.counts['EWDS'] += 1
+                self.write_enabled = False
+            elif sub == 0b10:
+                self.counts['ERAL'] += 1
+                if self._writable():
+                    for n in range(words):
+                        self._store(n, (1 << self.data_bits) - 1, WRITTEN)
+            elif len(body) >= self.data_bits:
+                self.counts['WRAL'] += 1
+                if self._writable():
+                    value = _bits_value(body[:self.data_bits])
+                    for n in range(words):
+                        self._store(n, value, WRITTEN)
+
+    def _writable(self):
+        """True if a programming command takes effect; counts it as ignored otherwise."""
+        if not self.write_enabled:
+            self.ignored += 1
+        return self.write_enabled
+
+    def coverage_ranges(self, value):
+        """[start, end) byte ranges whose coverage equals `value`."""
+        ranges = []
+        i = self.coverage.find(value)
+        while i != -1:
+            end = i
+            while end < EEPROM_SIZE and self.coverage[end] == value:
+                end += 1
+            ranges.append((i, end))
+            i = self.coverage.find(value, end)
+        return ranges
+
+
+def _bits_value(bits):
+    value = 0
+    for di, _ in bits:
+        value = value << 1 | di
+    return value
+
+
+def _match_channels(names, overrides):
+    """Map cs/clk/di/do to column indices using overrides or the usual signal names."""
+    lowered = [name.strip().lower() for name in names]
+    columns = {}
+    for signal, candidates in DEFAULT_NAMES.items():
+        wanted = (overrides.get(signal).lower(),) if overrides.get(signal) else candidates
+        for i, name in enumerate(lowered):
+            # Accept "CS", "Channel 0 (CS)", "cs [0]" and similar
+            tokens = re.split(r'[^a-z0-9]+', name)
+            if name in wanted or any(token in wanted for token in tokens):
+                columns[signal] = i
+                break
+        if signal not in columns:
+            raise ValueError(f"Capture has no {signal.upper()} channel (columns: {', '.join(names)})")
+    return columns
+
+
+def decode_csv(path, decoder, overrides):
+    """Stream a CSV export of 0/1 samples or transitions through the decoder."""
+    with open(path, 'rb') as f:
+        header = f.readline().decode('utf-8', 'replace').strip().split(',')
+        has_time = 'time' in header[0].lower()
+        names = header[1:] if has_time else header
+        columns = _match_channels(names, overrides)
+        width = len(names)
+
+        strip_time = re.compile(rb'^[^,\n]*,', re.M)
+        rising = re.compile(rb'01')
+        falling = re.compile(rb'10')
+        # Last sample of the previous chunk, so edges across the boundary are seen
+        last_cs, last_clk = b'0', b'0'
+        tail = b''
+
+        while True:
+            data = f.read(CHUNK_SIZE)
+            if data:
+                # Only whole rows are processed; the partial last row waits for the next chunk
+                chunk = tail + data
+                cut = chunk.rfind(b'\n') + 1
+                chunk, tail = chunk[:cut], chunk[cut:]
+                if not chunk:
+                    continue
+            elif tail:
+                chunk, tail = tail + b'\n', b''
+            else:
+                break
+
+            if has_time:
+                chunk = strip_time.sub(b'', chunk)
+            body = chunk.translate(None, b', \r\t\n')
+            if len(body) % width:
+                raise ValueError("Unsupported CSV: every channel value must be a single 0 or 1")
+
+            cs = last_cs + body[columns['cs']::width]
+            clk = last_clk + body[columns['clk']::width]
+            di = body[columns['di']::width]
+            do = body[columns['do']::width]
+
+            # (sample index, kind) events; the one-sample prefix makes match.start()
+            # the index of the edge sample within this chunk. At equal samples CS
+            # edges sort before the clock, so a clock on the CS-low sample is dropped.
+            events = [(m.start(), 0) for m in rising.finditer(cs)]
+            events += [(m.start(), 1) for m in falling.finditer(cs)]
+            events += [(m.start(), 2) for m in rising.finditer(clk)]
+            events.sort()
+
+            for sample, kind in events:
+                if kind == 0:
+                    decoder.start_frame()
+                elif kind == 1:
+                    decoder.end_frame()
+                else:
+                    decoder.clock(di[sample] == 0x31, do[sample] == 0x31)
+
+            if body:
+                last_cs, last_clk = cs[-1:], clk[-1:]
+
+    decoder.end_frame()
+
+
+def decode_vcd(path, decoder, overrides):
+    """Stream a VCD capture through the decoder, one value change at a time."""
+    codes = {}
+    with open(path, 'rb') as f:
+        names = {}
+        for line in f:
+            text = line.decode('utf-8', 'replace').split()
+            if len(text) >= 5 and text[0] == '$var':
+                names[text[4]] = text[3]
+            if text and text[0] == '$enddefinitions':
+                break
+        columns = _match_channels(list(names), overrides)
+        reference = list(names)
+        for signal, index in columns.items():
+            codes[names[reference[index]].encode()] = signal
+
+        state = {'cs': 0, 'clk': 0, 'di': 0, 'do': 0}
+        token = re.compile(rb'#\d+|[01xXzZ]\S+|b\S+\s+\S+|\$\w+')
+        tail = b''
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                chunk, tail = tail, b''
+                if not chunk:
+                    break
+            else:
+                chunk = tail + chunk
+                cut = max(chunk.rfind(b'\n'), chunk.rfind(b' ')) + 1
+                chunk, tail = chunk[:cut], chunk[cut:]
+
+            for match in token.finditer(chunk):
+                item = match.group()
+                if item[0] in b'#$b':
+                    continue
+                signal = codes.get(item[1:])
+                if signal is None:
+                    continue
+                value = 1 if item[0] == 0x31 else 0
+                previous = state[signal]
+                state[signal] = value
+                if signal == 'cs' and value != previous:
+                    decoder.start_frame() if value else decoder.end_frame()
+                elif signal == 'clk' and value and not previous and state['cs']:
+                    decoder.clock(state['di'], state['do'])
+
+    decoder.end_frame()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Porsche 986/996 ACU Microwire bus decoder',
+        epilog='Example: python3 microwire_decode.py boot.csv sniffed.bin && python3 eeprom_analyzer.py sniffed.bin'
+    )
+    parser.add_argument('capture', help='Logic analyzer export (.csv or .vcd)')
+    parser.add_argument('output', help='Reconstructed EEPROM image (512 bytes, unseen bytes = 0xFF)')
+    parser.add_argument('--org', type=int, choices=[8, 16], default=16,
+                        help='Chip organization on the ACU board (ORG pin): 16-bit words or 8-bit bytes')
+    parser.add_argument('--write-enabled', action='store_true',
+                        help='Capture starts after EWEN was sent (default: chip write-disabled, as at power-up)')
+    parser.add_argument('--cs', help='Name of the chip select channel')
+    parser.add_argument('--clk', help='Name of the clock channel')
+    parser.add_argument('--di', help='Name of the data-in channel (ACU -> EEPROM)')
+    parser.add_argument('--do', help='Name of the data-out channel (EEPROM -> ACU)')
+
+    args = parser.parse_args()
+    overrides = {'cs': args.cs, 'clk': args.clk, 'di': args.di, 'do': args.do}
+
+    decoder = MicrowireDecoder(args.org, args.write_enabled)
+    try:
+        if args.capture.lower().endswith('.vcd'):
+            decode_vcd(args.capture, decoder, overrides)
+        else:
+            decode_csv(args.capture, decoder, overrides)
+    except FileNotFoundError as e:
+        print(f"Error: File not found - {e.filename}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("PORSCHE 986/996 ACU MICROWIRE BUS DECODE")
+    print("=" * 70)
+    print(f"Capture: {args.capture}")
+    print(f"Organization: x{args.org}    Frames: {decoder.frames}")
+    print("  " + "  ".join(f"{name} {count}" for name, count in decoder.counts.items() if count))
+
+    seen = EEPROM_SIZE - decoder.coverage.count(UNSEEN)
+    print(f"\n[COVERAGE] {seen}/{EEPROM_SIZE} bytes ({100.0 * seen / EEPROM_SIZE:.1f}%)")
+    print("-" * 40)
+    for label, value in (('read', READ), ('written', WRITTEN), ('missing', UNSEEN)):
+        for start, end in decoder.coverage_ranges(value):
+            print(f"  {label:<8} 0x{start:03X}-0x{end - 1:03X} ({end - start} bytes)")
+    if decoder.ignored:
+        print(f"  ⚠ {decoder.ignored} write/erase commands ignored - sent while writes were disabled (no EWEN)")
+    if decoder.conflicts:
+        print(f"  ⚠ {decoder.conflicts} bytes read back with different values - noisy capture?")
+
+    with open(args.output, 'wb') as f:
+        f.write(decoder.image)
+    print(f"\n✓ Reconstructed EEPROM saved to: {args.output}")
+    if seen < EEPROM_SIZE:
+        print("  Missing bytes are 0xFF - check the coverage map before trusting those regions")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,9 @@ Examples:
     # Lock OBD access (disable programming via diagnostic port)
     python3 obd_unlock.py unlocked.bin locked.bin --lock
 
+    # Also save only the changed words, for programmers that can write single words
+    python3 obd_unlock.py locked.bin unlocked.bin --patch unlock.acup
+
 What this does:
     The ACU has an anti-theft feature that prevents key programming via
     OBD-II even with the correct PIN. This tool modifies three EEPROM
@@ -35,6 +38,9 @@ import sys
 import os
 import argparse
 
+from eeprom_image import EepromImage, encode_patch, print_plan
+from eeprom_rules import check_image, ERROR
+
 # Universal OBD unlock bytes (confirmed across multiple ABRITES unlocks)
 UNLOCK_REGION_1 = bytes.fromhex('F6 0A 00 F6 0A 00 75 00 00 30 30 01 03 02 00 00'.replace(' ', ''))
 UNLOCK_REGION_2 = bytes.fromhex('00 00 8B 3B 3B 3B 3B EB 3B 3B E6 3B 64 A0 A0 3D'.replace(' ', ''))
@@ -78,49 +84,32 @@ def check_obd_status(data):
 
 
 def verify_eeprom(data):
-    """Verify the EEPROM data looks valid."""
-    issues = []
-
-    if len(data) != 512:
-        issues.append(f"Size is {len(data)} bytes, expected 512")
-
-    if all(b == 0x00 for b in data):
-        issues.append("Data is all zeros - likely a bad read")
-    if all(b == 0xFF for b in data):
-        issues.append("Data is all 0xFF - likely erased or bad read")
-
-    # Check PIN locations match
-    if len(data) >= 0x1FA:
-        pin1 = data[0x1EE:0x1F1]
-        pin2 = data[0x1F7:0x1FA]
-        if pin1 != pin2:
-            issues.append("PIN codes at 0x1EE and 0x1F7 don't match - possible corruption")
-
-    return issues
+    """Verify the EEPROM data looks valid (error-level validation rules)."""
+    return [message for _, severity, message in check_image(data) if severity == ERROR]
 
 
 def unlock_obd(data):
-    """Apply OBD unlock patch to EEPROM data."""
-    data = bytearray(data)
+    """Apply OBD unlock patch to EEPROM data or an EepromImage. Returns an EepromImage tracking the changes."""
+    image = data if isinstance(data, EepromImage) else EepromImage(data)
 
     # Write all three unlock regions
-    data[OFFSET_REGION_1:OFFSET_REGION_1 + len(UNLOCK_REGION_1)] = UNLOCK_REGION_1
-    data[OFFSET_REGION_2:OFFSET_REGION_2 + len(UNLOCK_REGION_2)] = UNLOCK_REGION_2
-    data[OFFSET_REGION_3:OFFSET_REGION_3 + len(UNLOCK_REGION_3)] = UNLOCK_REGION_3
+    image.write(OFFSET_REGION_1, UNLOCK_REGION_1)
+    image.write(OFFSET_REGION_2, UNLOCK_REGION_2)
+    image.write(OFFSET_REGION_3, UNLOCK_REGION_3)
 
-    return bytes(data)
+    return image
 
 
 def lock_obd(data):
-    """Apply OBD lock patch to EEPROM data."""
-    data = bytearray(data)
+    """Apply OBD lock patch to EEPROM data or an EepromImage. Returns an EepromImage tracking the changes."""
+    image = data if isinstance(data, EepromImage) else EepromImage(data)
 
     # Write all three lock regions
-    data[OFFSET_REGION_1:OFFSET_REGION_1 + len(LOCK_REGION_1)] = LOCK_REGION_1
-    data[OFFSET_REGION_2:OFFSET_REGION_2 + len(LOCK_REGION_2)] = LOCK_REGION_2
-    data[OFFSET_REGION_3:OFFSET_REGION_3 + len(LOCK_REGION_3)] = LOCK_REGION_3
+    image.write(OFFSET_REGION_1, LOCK_REGION_1)
+    image.write(OFFSET_REGION_2, LOCK_REGION_2)
+    image.write(OFFSET_REGION_3, LOCK_REGION_3)
 
-    return bytes(data)
+    return image
 
 
 def print_regions(data, label):
@@ -158,6 +147,7 @@ Notes:
     parser.add_argument('--lock', action='store_true', help='Lock OBD access (default is unlock)')
     parser.add_argument('--check', action='store_true', help='Only check current status, no modification')
     parser.add_argument('--force', '-f', action='store_true', help='Force operation despite warnings')
+    parser.add_argument('--patch', '-p', help='Also write only the changed words as a compact .acup patch')
 
     args = parser.parse_args()
 
@@ -208,6 +198,10 @@ Notes:
         print("\nError: Output file required (or use --check to only check status)")
         sys.exit(1)
 
+    if len(data) != 512:
+        print("\nError: Only 512-byte dumps can be patched")
+        sys.exit(1)
+
     print(f"Output: {args.output}")
     print(f"Action: {'LOCK' if args.lock else 'UNLOCK'}")
     print("=" * 60)
@@ -215,16 +209,20 @@ Notes:
     # Show before state
     print_regions(data, "BEFORE")
 
+    # Baseline over the whole image, so the check after patching is incremental
+    image = EepromImage(data)
+    image.validate()
+
     # Apply modification
     if args.lock:
         if status == 'locked':
             print("\nNote: EEPROM already appears to be locked")
-        modified = lock_obd(data)
+        modified = lock_obd(image)
         action = "locked"
     else:
         if status == 'unlocked':
             print("\nNote: EEPROM already appears to be unlocked")
-        modified = unlock_obd(data)
+        modified = unlock_obd(image)
         action = "unlocked"
 
     # Show after state
@@ -241,13 +239,26 @@ Notes:
     else:
         print("  ⚠ WARNING: PIN mismatch!")
 
+    # Re-validate: only the rules that read the changed OBD bytes run again
+    errors = [message for _, severity, message in modified.validate() if severity == ERROR]
+    for message in errors:
+        print(f"  ⚠ WARNING: {message}")
+
+    # Only these words need to be reflashed
+    print_plan(modified)
+
     # Write output
     with open(args.output, 'wb') as f:
-        f.write(modified)
+        f.write(bytes(modified))
 
     print(f"\n✓ Modified EEPROM saved to: {args.output}")
     print(f"  File size: {len(modified)} bytes")
 
+    if args.patch:
+        with open(args.patch, 'wb') as f:
+            f.write(encode_patch(modified))
+        print(f"✓ Minimal write patch saved to: {args.patch}")
+
     print("\n" + "=" * 60)
     print(f"SUCCESS! OBD access is now {action.upper()}")
     print("=" * 60)
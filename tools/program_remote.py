@@ -29,6 +29,9 @@ import sys
 import os
 import argparse
 
+from eeprom_image import EepromImage, encode_patch, print_plan
+from eeprom_rules import check_image, ERROR
+
 
 def swap_bytes(data):
     """
@@ -97,30 +100,18 @@ def get_slot_offset(slot_num):
     return offsets[slot_num]
 
 
+def slot_has_data(data, slot_num):
+    """True if the slot holds something other than the empty/filler values FF, B7, 06, 00."""
+    offset = get_slot_offset(slot_num)
+    return not set(data[offset:offset + 12]) <= {0xFF, 0xB7, 0x06, 0x00}
+
+
 def verify_eeprom(data):
-    """Verify the EEPROM data looks valid."""
-    issues = []
-    
-    if len(data) != 512:
-        issues.append(f"Size is {len(data)} bytes, expected 512")
-    
-    # Check for all zeros or all FFs (likely bad read)
-    if all(b == 0x00 for b in data):
-        issues.append("Data is all zeros - likely a bad read")
-    if all(b == 0xFF for b in data):
-        issues.append("Data is all 0xFF - likely erased or bad read")
-    
-    # Check PIN locations match
-    if len(data) >= 0x1FA:
-        pin1 = data[0x1EE:0x1F1]
-        pin2 = data[0x1F7:0x1FA]
-        if pin1 != pin2:
-            issues.append("PIN codes at 0x1EE and 0x1F7 don't match")
-    
-    return issues
+    """Verify the EEPROM data looks valid (error-level validation rules)."""
+    return [message for _, severity, message in check_image(data) if severity == ERROR]
 
 
-def program_remote(input_file, output_file, slot_num, hex_code, force=False, no_swap=False):
+def program_remote(input_file, output_file, slot_num, hex_code, force=False, no_swap=False, patch_file=None):
     """Program a remote code into an EEPROM dump."""
 
     # Parse the hex code
@@ -128,7 +119,7 @@ def program_remote(input_file, output_file, slot_num, hex_code, force=False, no_
 
     # Read the input file
     with open(input_file, 'rb') as f:
-        data = bytearray(f.read())
+        data = f.read()
 
     # Verify EEPROM
     issues = verify_eeprom(data)
@@ -139,6 +130,13 @@ def program_remote(input_file, output_file, slot_num, hex_code, force=False, no_
         print("\nUse --force to proceed anyway")
         return False
 
+    if len(data) != 512:
+        print("Error: Only 512-byte dumps can be patched")
+        return False
+    image = EepromImage(data)
+    # Baseline over the whole image, so the check after the edit is incremental
+    image.validate()
+
     # Get slot offset
     offset = get_slot_offset(slot_num)
 
@@ -160,8 +158,7 @@ def program_remote(input_file, output_file, slot_num, hex_code, force=False, no_
     
     # Check if slot already has data
     current_slot = data[offset:offset+12]
-    unique_vals = set(current_slot)
-    if not (unique_vals <= {0xFF, 0xB7, 0x06, 0x00}):
+    if slot_has_data(data, slot_num):
         print(f"\n⚠ WARNING: Slot {slot_num} already contains data!")
         print(f"  Current: {' '.join(f'{b:02X}' for b in current_slot)}")
         if not force:
@@ -171,15 +168,15 @@ def program_remote(input_file, output_file, slot_num, hex_code, force=False, no_
                 return False
     
     # Write the 12-byte remote code (byte-swapped)
-    data[offset:offset+12] = swapped_code
+    image.write(offset, swapped_code)
     
     # Show after state
     print(f"\nAFTER (0x{offset:03X}-0x{offset+15:03X}):")
-    print(f"  {' '.join(f'{b:02X}' for b in data[offset:offset+16])}")
+    print(f"  {' '.join(f'{b:02X}' for b in image[offset:offset+16])}")
     
     # Verify PIN is still intact
-    pin1 = data[0x1EE:0x1F1]
-    pin2 = data[0x1F7:0x1FA]
+    pin1 = image[0x1EE:0x1F1]
+    pin2 = image[0x1F7:0x1FA]
     print(f"\nPIN verification:")
     print(f"  Location 0x1EE: {' '.join(f'{b:02X}' for b in pin1)}")
     print(f"  Location 0x1F7: {' '.join(f'{b:02X}' for b in pin2)}")
@@ -188,12 +185,25 @@ def program_remote(input_file, output_file, slot_num, hex_code, force=False, no_
     else:
         print(f"  ⚠ WARNING: PIN mismatch detected!")
     
+    # Re-validate: only the rules that read the changed slot bytes run again
+    for _, severity, message in image.validate():
+        if severity == ERROR:
+            print(f"  ⚠ WARNING: {message}")
+
+    # Only these words need to be reflashed
+    print_plan(image)
+
     # Write output file
     with open(output_file, 'wb') as f:
-        f.write(data)
+        f.write(bytes(image))
     
     print(f"\n✓ Modified EEPROM saved to: {output_file}")
-    print(f"  File size: {len(data)} bytes")
+    print(f"  File size: {len(image)} bytes")
+
+    if patch_file:
+        with open(patch_file, 'wb') as f:
+            f.write(encode_patch(image))
+        print(f"✓ Minimal write patch saved to: {patch_file}")
     
     return True
 
@@ -231,6 +241,7 @@ Notes:
     parser.add_argument('--force', '-f', action='store_true', help='Force operation, skip confirmations')
     parser.add_argument('--no-swap', action='store_true',
                         help='Do NOT byte-swap the code (use if code is already in EEPROM format)')
+    parser.add_argument('--patch', '-p', help='Also write only the changed words as a compact .acup patch')
 
     args = parser.parse_args()
     
@@ -248,7 +259,8 @@ Notes:
     print("=" * 60)
     
     try:
-        success = program_remote(args.input, args.output, args.slot, args.code, args.force, args.no_swap)
+        success = program_remote(args.input, args.output, args.slot, args.code, args.force, args.no_swap,
+                                 args.patch)
         
         if success:
             print("\n" + "=" * 60)